@@ -4,18 +4,24 @@ Authentication API routes for ChainGuard AI
 
 from datetime import timedelta
 from typing import List, Optional
+from urllib.parse import urlencode
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
 from app.core.database import get_db
 from app.core.security import (
-    verify_password, get_password_hash, create_access_token, create_refresh_token,
+    verify_password_async, get_password_hash_async, create_access_token, create_refresh_token,
     verify_token, get_current_user_id, get_current_tenant_id, get_current_user_permissions,
     log_security_event, get_client_ip, rate_limit, generate_secure_password,
-    create_session_token, invalidate_session, generate_totp_secret, verify_totp,
-    generate_backup_codes, encrypt_sensitive_data, decrypt_sensitive_data
+    hash_refresh_token, DUMMY_PASSWORD_HASH, password_hash_needs_update,
+    create_session_token, hash_session_token, invalidate_session,
+    generate_totp_secret, verify_totp,
+    generate_backup_codes, hash_backup_code, encrypt_sensitive_data,
+    decrypt_sensitive_data
 )
 from app.schemas.auth import (
     LoginRequest, LoginResponse, RefreshTokenRequest, RefreshTokenResponse,
@@ -37,6 +43,115 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 security = HTTPBearer()
 
+# Provisioning-URI skeleton for 2FA setup; only the per-user query string is
+# built at request time
+_OTPAUTH_TEMPLATE = "otpauth://totp/ChainGuard:{uid}?{qs}"
+
+
+# Module-level prepared statements
+#
+# Hoisting each query into a text() constant lets SQLAlchemy reuse the
+# compiled statement and asyncpg keep the prepared statement in its cache,
+# instead of re-parsing and re-planning the SQL on every request.
+# Project only the columns needed to authenticate and build UserResponse;
+# SELECT * would also drag wide TOAST-able fields over the wire
+_Q_LOGIN_USER = text(
+    """
+    SELECT id, email, username, first_name, last_name, is_active, is_verified,
+           tenant_id, password_hash, totp_secret, profile_picture_url, bio,
+           timezone, language, last_login_at, created_at, updated_at
+    FROM user WHERE email = :email AND is_active = true
+    """
+)
+
+_Q_LOGIN_WRITES = text(
+    """
+    WITH ins_rt AS (
+        INSERT INTO refreshtoken (token_hash, user_id, expires_at, created_at)
+        VALUES (:token_hash, :user_id, NOW() + INTERVAL '30 days', NOW())
+    ), upd_u AS (
+        UPDATE user SET last_login_at = NOW() WHERE id = :user_id
+    )
+    INSERT INTO usersession (session_id, user_id, tenant_id, user_agent, ip_address, expires_at, created_at)
+    VALUES (:session_id, :user_id, :tenant_id, :user_agent, :ip_address, NOW() + INTERVAL '24 hours', NOW())
+    """
+)
+
+_Q_REFRESH_TOKEN_LOOKUP = text(
+    "SELECT id FROM refreshtoken WHERE token_hash = :token_hash AND expires_at > NOW()"
+)
+
+_Q_DELETE_REFRESH_TOKEN_BY_HASH = text(
+    "DELETE FROM refreshtoken WHERE token_hash = :token_hash"
+)
+
+# Uniqueness is enforced by the unique indexes on email/username; the insert
+# and the existence check collapse into one atomic statement
+_Q_INSERT_USER = text(
+    """
+    INSERT INTO user (email, username, password_hash, first_name, last_name,
+                     is_active, is_verified, tenant_id, created_at, updated_at)
+    VALUES (:email, :username, :password_hash, :first_name, :last_name,
+            :is_active, :is_verified, :tenant_id, NOW(), NOW())
+    ON CONFLICT DO NOTHING
+    RETURNING id, created_at, updated_at
+    """
+)
+
+_Q_USER_PASSWORD_HASH = text(
+    "SELECT password_hash FROM user WHERE id = :user_id"
+)
+
+_Q_UPDATE_PASSWORD = text(
+    "UPDATE user SET password_hash = :password_hash, updated_at = NOW() WHERE id = :user_id"
+)
+
+_Q_DELETE_USER_REFRESH_TOKENS = text(
+    "DELETE FROM refreshtoken WHERE user_id = :user_id"
+)
+
+_Q_ACTIVE_USER_ID_BY_EMAIL = text(
+    "SELECT id FROM user WHERE email = :email AND is_active = true"
+)
+
+_Q_MARK_VERIFIED = text(
+    "UPDATE user SET is_verified = true, updated_at = NOW() WHERE id = :user_id"
+)
+
+_Q_UNVERIFIED_USER_ID_BY_EMAIL = text(
+    "SELECT id FROM user WHERE email = :email AND is_verified = false"
+)
+
+_Q_REHASH_PASSWORD = text(
+    "UPDATE user SET password_hash = :password_hash, updated_at = NOW() WHERE id = :user_id"
+)
+
+_Q_SET_2FA = text(
+    "UPDATE user SET totp_secret = :totp_secret, backup_codes = :backup_codes, updated_at = NOW() WHERE id = :user_id"
+)
+
+_Q_USER_TOTP_SECRET = text(
+    "SELECT totp_secret FROM user WHERE id = :user_id"
+)
+
+_Q_USER_2FA_CREDENTIALS = text(
+    "SELECT password_hash, backup_codes FROM user WHERE id = :user_id"
+)
+
+_Q_CLEAR_2FA = text(
+    "UPDATE user SET totp_secret = NULL, backup_codes = NULL, updated_at = NOW() WHERE id = :user_id"
+)
+
+_Q_USER_PERMISSIONS = text(
+    """
+    SELECT DISTINCT p.name
+    FROM permission p
+    JOIN role_permissions rp ON p.id = rp.permission_id
+    JOIN user_roles ur ON rp.role_id = ur.role_id
+    WHERE ur.user_id = :user_id
+    """
+)
+
 
 @router.post("/login", response_model=LoginResponse)
 @rate_limit(max_requests=5, window_seconds=300)  # 5 attempts per 5 minutes
@@ -46,161 +161,151 @@ async def login(
     db: AsyncSession = Depends(get_db)
 ):
     """User login endpoint"""
-    try:
-        # Get user by email
-        result = await db.execute(
-            "SELECT * FROM user WHERE email = :email AND is_active = true",
-            {"email": request.email}
+    # Get user by email
+    result = await db.execute(_Q_LOGIN_USER, {"email": request.email})
+    user_data = result.fetchone()
+    
+    if not user_data:
+        # Burn a bcrypt verification against a dummy hash so the
+        # unknown-user path takes as long as a wrong-password one,
+        # preventing email enumeration via response timing
+        await verify_password_async(request.password, DUMMY_PASSWORD_HASH)
+        log_security_event(
+            "login_failed",
+            "unknown",
+            "unknown",
+            {"email": request.email, "reason": "user_not_found"},
+            get_client_ip(req)
         )
-        user_data = result.fetchone()
-        
-        if not user_data:
-            log_security_event(
-                "login_failed",
-                "unknown",
-                "unknown",
-                {"email": request.email, "reason": "user_not_found"},
-                get_client_ip(req)
-            )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+    
+    # Verify password
+    if not await verify_password_async(request.password, user_data.password_hash):
+        log_security_event(
+            "login_failed",
+            user_data.id,
+            user_data.tenant_id,
+            {"email": request.email, "reason": "invalid_password"},
+            get_client_ip(req)
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+    
+    # Migrate legacy bcrypt hashes to argon2id now that we hold the
+    # plaintext; piggybacks on the login transaction committed below
+    if password_hash_needs_update(user_data.password_hash):
+        new_hash = await get_password_hash_async(request.password)
+        await db.execute(
+            _Q_REHASH_PASSWORD,
+            {"password_hash": new_hash, "user_id": user_data.id}
+        )
+
+    # Check if user is verified
+    if not user_data.is_verified:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email not verified"
+        )
+    
+    # Verify 2FA if enabled
+    if user_data.totp_secret:
+        if not request.totp_token:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid credentials"
+                detail="2FA token required"
             )
         
-        # Verify password
-        if not verify_password(request.password, user_data.password_hash):
+        if not verify_totp(user_data.totp_secret, request.totp_token):
             log_security_event(
                 "login_failed",
                 user_data.id,
                 user_data.tenant_id,
-                {"email": request.email, "reason": "invalid_password"},
+                {"email": request.email, "reason": "invalid_2fa"},
                 get_client_ip(req)
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid credentials"
-            )
-        
-        # Check if user is verified
-        if not user_data.is_verified:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Email not verified"
+                detail="Invalid 2FA token"
             )
-        
-        # Verify 2FA if enabled
-        if user_data.totp_secret:
-            if not request.totp_token:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="2FA token required"
-                )
-            
-            if not verify_totp(user_data.totp_secret, request.totp_token):
-                log_security_event(
-                    "login_failed",
-                    user_data.id,
-                    user_data.tenant_id,
-                    {"email": request.email, "reason": "invalid_2fa"},
-                    get_client_ip(req)
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid 2FA token"
-                )
-        
-        # Get user permissions
-        permissions = await get_user_permissions(db, user_data.id)
-        
-        # Create tokens
-        access_token_expires = timedelta(minutes=30 if not request.remember_me else 1440)  # 30 min or 24 hours
-        access_token = create_access_token(
-            subject=user_data.id,
-            expires_delta=access_token_expires,
-            tenant_id=user_data.tenant_id,
-            permissions=permissions
-        )
-        
-        refresh_token = create_refresh_token(subject=user_data.id)
-        
-        # Store refresh token
-        await db.execute(
-            "INSERT INTO refreshtoken (token_hash, user_id, expires_at, created_at) VALUES (:token_hash, :user_id, :expires_at, NOW())",
-            {
-                "token_hash": get_password_hash(refresh_token),
-                "user_id": user_data.id,
-                "expires_at": timedelta(days=30)
-            }
-        )
-        
-        # Update last login
-        await db.execute(
-            "UPDATE user SET last_login_at = NOW() WHERE id = :user_id",
-            {"user_id": user_data.id}
-        )
-        
-        # Create session
-        session_token = create_session_token(user_data.id, user_data.tenant_id)
-        await db.execute(
-            "INSERT INTO usersession (session_id, user_id, tenant_id, user_agent, ip_address, expires_at, created_at) VALUES (:session_id, :user_id, :tenant_id, :user_agent, :ip_address, :expires_at, NOW())",
-            {
-                "session_id": session_token,
-                "user_id": user_data.id,
-                "tenant_id": user_data.tenant_id,
-                "user_agent": req.headers.get("User-Agent"),
-                "ip_address": get_client_ip(req),
-                "expires_at": timedelta(hours=24)
-            }
-        )
-        
-        await db.commit()
-        
-        # Log successful login
-        log_security_event(
-            "login_success",
-            user_data.id,
-            user_data.tenant_id,
-            {"email": request.email},
-            get_client_ip(req)
-        )
-        
-        # Build user response
-        user_response = UserResponse(
-            id=user_data.id,
-            email=user_data.email,
-            username=user_data.username,
-            first_name=user_data.first_name,
-            last_name=user_data.last_name,
-            is_active=user_data.is_active,
-            is_verified=user_data.is_verified,
-            tenant_id=user_data.tenant_id,
-            profile_picture_url=user_data.profile_picture_url,
-            bio=user_data.bio,
-            timezone=user_data.timezone,
-            language=user_data.language,
-            last_login_at=user_data.last_login_at,
-            created_at=user_data.created_at,
-            updated_at=user_data.updated_at,
-            roles=[],
-            permissions=permissions
-        )
-        
-        return LoginResponse(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer",
-            expires_in=int(access_token_expires.total_seconds()),
-            user=user_response
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Login error", error=str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+    
+    # Get user permissions
+    permissions = await get_user_permissions(db, user_data.id)
+    
+    # Create tokens
+    access_token_expires = timedelta(minutes=30 if not request.remember_me else 1440)  # 30 min or 24 hours
+    access_token = create_access_token(
+        subject=user_data.id,
+        expires_delta=access_token_expires,
+        tenant_id=user_data.tenant_id,
+        permissions=permissions
+    )
+    
+    refresh_token = create_refresh_token(subject=user_data.id)
+
+    # Store refresh token, update last login and create the session in a
+    # single round-trip instead of three sequential statements
+    session_token = create_session_token(user_data.id, user_data.tenant_id)
+    await db.execute(
+        _Q_LOGIN_WRITES,
+        {
+            "token_hash": hash_refresh_token(refresh_token),
+            "user_id": user_data.id,
+            "session_id": hash_session_token(session_token),
+            "tenant_id": user_data.tenant_id,
+            "user_agent": req.headers.get("User-Agent"),
+            "ip_address": get_client_ip(req)
+        }
+    )
+
+    await db.commit()
+    
+    # Log successful login
+    log_security_event(
+        "login_success",
+        user_data.id,
+        user_data.tenant_id,
+        {"email": request.email},
+        get_client_ip(req)
+    )
+    
+    # Build user response; model_construct skips re-validating values
+    # that just came out of the database
+    user_response = UserResponse.model_construct(
+        id=user_data.id,
+        email=user_data.email,
+        username=user_data.username,
+        first_name=user_data.first_name,
+        last_name=user_data.last_name,
+        is_active=user_data.is_active,
+        is_verified=user_data.is_verified,
+        tenant_id=user_data.tenant_id,
+        profile_picture_url=user_data.profile_picture_url,
+        bio=user_data.bio,
+        timezone=user_data.timezone,
+        language=user_data.language,
+        last_login_at=user_data.last_login_at,
+        created_at=user_data.created_at,
+        updated_at=user_data.updated_at,
+        roles=[],
+        permissions=permissions
+    )
+    
+    login_response = LoginResponse.model_construct(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+        expires_in=int(access_token_expires.total_seconds()),
+        user=user_response
+    )
+
+    # Serialize once through orjson instead of letting FastAPI run the
+    # model back through jsonable_encoder + json.dumps
+    return ORJSONResponse(content=login_response.model_dump(mode="json"))
 
 
 @router.post("/refresh", response_model=RefreshTokenResponse)
@@ -209,55 +314,47 @@ async def refresh_token(
     db: AsyncSession = Depends(get_db)
 ):
     """Refresh access token"""
-    try:
-        # Verify refresh token
-        payload = verify_token(request.refresh_token)
-        
-        if payload.get("type") != "refresh":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token type"
-            )
-        
-        user_id = payload.get("sub")
-        
-        # Check if refresh token exists in database
-        result = await db.execute(
-            "SELECT * FROM refreshtoken WHERE user_id = :user_id AND expires_at > NOW()",
-            {"user_id": user_id}
-        )
-        refresh_token_data = result.fetchone()
-        
-        if not refresh_token_data:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid refresh token"
-            )
-        
-        # Get user permissions
-        permissions = await get_user_permissions(db, user_id)
-        
-        # Create new access token
-        access_token = create_access_token(
-            subject=user_id,
-            tenant_id=payload.get("tenant_id"),
-            permissions=permissions
-        )
-        
-        return RefreshTokenResponse(
-            access_token=access_token,
-            token_type="bearer",
-            expires_in=1800  # 30 minutes
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Token refresh error", error=str(e))
+    # Verify refresh token
+    payload = verify_token(request.refresh_token)
+    
+    if payload.get("type") != "refresh":
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type"
+        )
+    
+    user_id = payload.get("sub")
+    
+    # Check that this exact refresh token is still live, via an index
+    # seek on its deterministic hash
+    result = await db.execute(
+        _Q_REFRESH_TOKEN_LOOKUP,
+        {"token_hash": hash_refresh_token(request.refresh_token)}
+    )
+    refresh_token_data = result.fetchone()
+    
+    if not refresh_token_data:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    
+    # Get user permissions
+    permissions = await get_user_permissions(db, user_id)
+    
+    # Create new access token
+    access_token = create_access_token(
+        subject=user_id,
+        tenant_id=payload.get("tenant_id"),
+        permissions=permissions
+    )
+    
+    return RefreshTokenResponse(
+        access_token=access_token,
+        token_type="bearer",
+        expires_in=1800  # 30 minutes
+    )
+    
 
 
 @router.post("/logout")
@@ -266,23 +363,16 @@ async def logout(
     db: AsyncSession = Depends(get_db)
 ):
     """Logout user"""
-    try:
-        # Invalidate refresh token
-        await db.execute(
-            "DELETE FROM refreshtoken WHERE token_hash = :token_hash",
-            {"token_hash": get_password_hash(request.refresh_token)}
-        )
-        
-        await db.commit()
-        
-        return {"message": "Successfully logged out"}
-        
-    except Exception as e:
-        logger.error("Logout error", error=str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+    # Invalidate refresh token
+    await db.execute(
+        _Q_DELETE_REFRESH_TOKEN_BY_HASH,
+        {"token_hash": hash_refresh_token(request.refresh_token)}
+    )
+    
+    await db.commit()
+    
+    return {"message": "Successfully logged out"}
+    
 
 
 @router.post("/register", response_model=UserResponse)
@@ -293,79 +383,60 @@ async def register(
     db: AsyncSession = Depends(get_db)
 ):
     """User registration endpoint"""
-    try:
-        # Check if user already exists
-        result = await db.execute(
-            "SELECT id FROM user WHERE email = :email OR username = :username",
-            {"email": request.email, "username": request.username}
-        )
-        existing_user = result.fetchone()
-        
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="User with this email or username already exists"
-            )
-        
-        # Hash password
-        password_hash = get_password_hash(request.password)
-        
-        # Create user
-        await db.execute(
-            """
-            INSERT INTO user (email, username, password_hash, first_name, last_name, 
-                             is_active, is_verified, tenant_id, created_at, updated_at)
-            VALUES (:email, :username, :password_hash, :first_name, :last_name,
-                    :is_active, :is_verified, :tenant_id, NOW(), NOW())
-            """,
-            {
-                "email": request.email,
-                "username": request.username,
-                "password_hash": password_hash,
-                "first_name": request.first_name,
-                "last_name": request.last_name,
-                "is_active": request.is_active,
-                "is_verified": request.is_verified,
-                "tenant_id": request.tenant_id
-            }
-        )
-        
-        await db.commit()
-        
-        # Log registration
-        log_security_event(
-            "user_registered",
-            "new_user",
-            request.tenant_id or "unknown",
-            {"email": request.email, "username": request.username},
-            get_client_ip(req)
-        )
-        
-        # Return user data (without password)
-        return UserResponse(
-            id="new_user_id",  # Would be actual ID in real implementation
-            email=request.email,
-            username=request.username,
-            first_name=request.first_name,
-            last_name=request.last_name,
-            is_active=request.is_active,
-            is_verified=request.is_verified,
-            tenant_id=request.tenant_id or "",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-            roles=[],
-            permissions=[]
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Registration error", error=str(e))
+    # Hash password
+    password_hash = await get_password_hash_async(request.password)
+
+    # Create user; ON CONFLICT DO NOTHING makes the duplicate check and
+    # the insert a single atomic round-trip with no race window
+    result = await db.execute(
+        _Q_INSERT_USER,
+        {
+            "email": request.email,
+            "username": request.username,
+            "password_hash": password_hash,
+            "first_name": request.first_name,
+            "last_name": request.last_name,
+            "is_active": request.is_active,
+            "is_verified": request.is_verified,
+            "tenant_id": request.tenant_id
+        }
+    )
+    new_user = result.fetchone()
+
+    if not new_user:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this email or username already exists"
         )
 
+    await db.commit()
+    
+    # Log registration
+    log_security_event(
+        "user_registered",
+        "new_user",
+        request.tenant_id or "unknown",
+        {"email": request.email, "username": request.username},
+        get_client_ip(req)
+    )
+    
+    # Return user data (without password)
+    return UserResponse(
+        id=new_user.id,
+        email=request.email,
+        username=request.username,
+        first_name=request.first_name,
+        last_name=request.last_name,
+        is_active=request.is_active,
+        is_verified=request.is_verified,
+        tenant_id=request.tenant_id or "",
+        created_at=new_user.created_at,
+        updated_at=new_user.updated_at,
+        roles=[],
+        permissions=[]
+    )
+    
+
 
 @router.post("/change-password")
 async def change_password(
@@ -374,52 +445,39 @@ async def change_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Change user password"""
-    try:
-        # Get current user
-        result = await db.execute(
-            "SELECT password_hash FROM user WHERE id = :user_id",
-            {"user_id": current_user_id}
-        )
-        user_data = result.fetchone()
-        
-        if not user_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        # Verify current password
-        if not verify_password(request.current_password, user_data.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Current password is incorrect"
-            )
-        
-        # Update password
-        new_password_hash = get_password_hash(request.new_password)
-        await db.execute(
-            "UPDATE user SET password_hash = :password_hash, updated_at = NOW() WHERE id = :user_id",
-            {"password_hash": new_password_hash, "user_id": current_user_id}
-        )
-        
-        # Invalidate all refresh tokens
-        await db.execute(
-            "DELETE FROM refreshtoken WHERE user_id = :user_id",
-            {"user_id": current_user_id}
-        )
-        
-        await db.commit()
-        
-        return {"message": "Password changed successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Password change error", error=str(e))
+    # Get current user
+    result = await db.execute(
+        _Q_USER_PASSWORD_HASH, {"user_id": current_user_id}
+    )
+    user_data = result.fetchone()
+    
+    if not user_data:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
+    
+    # Verify current password
+    if not await verify_password_async(request.current_password, user_data.password_hash):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Current password is incorrect"
+        )
+    
+    # Update password
+    new_password_hash = await get_password_hash_async(request.new_password)
+    await db.execute(
+        _Q_UPDATE_PASSWORD,
+        {"password_hash": new_password_hash, "user_id": current_user_id}
+    )
+    
+    # Invalidate all refresh tokens
+    await db.execute(_Q_DELETE_USER_REFRESH_TOKENS, {"user_id": current_user_id})
+    
+    await db.commit()
+    
+    return {"message": "Password changed successfully"}
+    
 
 
 @router.post("/reset-password")
@@ -428,33 +486,23 @@ async def reset_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Request password reset"""
-    try:
-        # Check if user exists
-        result = await db.execute(
-            "SELECT id FROM user WHERE email = :email AND is_active = true",
-            {"email": request.email}
+    # Check if user exists
+    result = await db.execute(_Q_ACTIVE_USER_ID_BY_EMAIL, {"email": request.email})
+    user_data = result.fetchone()
+    
+    if user_data:
+        # Generate reset token (in real implementation, send email)
+        reset_token = create_access_token(
+            subject=user_data.id,
+            expires_delta=timedelta(hours=1)
         )
-        user_data = result.fetchone()
-        
-        if user_data:
-            # Generate reset token (in real implementation, send email)
-            reset_token = create_access_token(
-                subject=user_data.id,
-                expires_delta=timedelta(hours=1)
-            )
-            
-            # Store reset token (in real implementation, store in database)
-            logger.info(f"Password reset token for {request.email}: {reset_token}")
-        
-        # Always return success to prevent email enumeration
-        return {"message": "If the email exists, a reset link has been sent"}
         
-    except Exception as e:
-        logger.error("Password reset error", error=str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+        # Store reset token (in real implementation, store in database)
+        logger.info(f"Password reset token for {request.email}: {reset_token}")
+    
+    # Always return success to prevent email enumeration
+    return {"message": "If the email exists, a reset link has been sent"}
+    
 
 
 @router.post("/reset-password/confirm")
@@ -463,36 +511,24 @@ async def reset_password_confirm(
     db: AsyncSession = Depends(get_db)
 ):
     """Confirm password reset"""
-    try:
-        # Verify reset token
-        payload = verify_token(request.token)
-        user_id = payload.get("sub")
-        
-        # Update password
-        new_password_hash = get_password_hash(request.new_password)
-        await db.execute(
-            "UPDATE user SET password_hash = :password_hash, updated_at = NOW() WHERE id = :user_id",
-            {"password_hash": new_password_hash, "user_id": user_id}
-        )
-        
-        # Invalidate all refresh tokens
-        await db.execute(
-            "DELETE FROM refreshtoken WHERE user_id = :user_id",
-            {"user_id": user_id}
-        )
-        
-        await db.commit()
-        
-        return {"message": "Password reset successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Password reset confirm error", error=str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+    # Verify reset token
+    payload = verify_token(request.token)
+    user_id = payload.get("sub")
+    
+    # Update password
+    new_password_hash = await get_password_hash_async(request.new_password)
+    await db.execute(
+        _Q_UPDATE_PASSWORD,
+        {"password_hash": new_password_hash, "user_id": user_id}
+    )
+    
+    # Invalidate all refresh tokens
+    await db.execute(_Q_DELETE_USER_REFRESH_TOKENS, {"user_id": user_id})
+    
+    await db.commit()
+    
+    return {"message": "Password reset successfully"}
+    
 
 
 @router.post("/verify-email")
@@ -501,28 +537,16 @@ async def verify_email(
     db: AsyncSession = Depends(get_db)
 ):
     """Verify email address"""
-    try:
-        # Verify token and update user
-        payload = verify_token(request.token)
-        user_id = payload.get("sub")
-        
-        await db.execute(
-            "UPDATE user SET is_verified = true, updated_at = NOW() WHERE id = :user_id",
-            {"user_id": user_id}
-        )
-        
-        await db.commit()
-        
-        return {"message": "Email verified successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Email verification error", error=str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+    # Verify token and update user
+    payload = verify_token(request.token)
+    user_id = payload.get("sub")
+    
+    await db.execute(_Q_MARK_VERIFIED, {"user_id": user_id})
+    
+    await db.commit()
+    
+    return {"message": "Email verified successfully"}
+    
 
 
 @router.post("/resend-verification")
@@ -531,32 +555,22 @@ async def resend_verification(
     db: AsyncSession = Depends(get_db)
 ):
     """Resend email verification"""
-    try:
-        # Check if user exists and is not verified
-        result = await db.execute(
-            "SELECT id FROM user WHERE email = :email AND is_verified = false",
-            {"email": request.email}
+    # Check if user exists and is not verified
+    result = await db.execute(_Q_UNVERIFIED_USER_ID_BY_EMAIL, {"email": request.email})
+    user_data = result.fetchone()
+    
+    if user_data:
+        # Generate verification token (in real implementation, send email)
+        verification_token = create_access_token(
+            subject=user_data.id,
+            expires_delta=timedelta(hours=24)
         )
-        user_data = result.fetchone()
         
-        if user_data:
-            # Generate verification token (in real implementation, send email)
-            verification_token = create_access_token(
-                subject=user_data.id,
-                expires_delta=timedelta(hours=24)
-            )
-            
-            logger.info(f"Verification token for {request.email}: {verification_token}")
-        
-        # Always return success to prevent email enumeration
-        return {"message": "If the email exists and is not verified, a verification link has been sent"}
-        
-    except Exception as e:
-        logger.error("Resend verification error", error=str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+        logger.info(f"Verification token for {request.email}: {verification_token}")
+    
+    # Always return success to prevent email enumeration
+    return {"message": "If the email exists and is not verified, a verification link has been sent"}
+    
 
 
 # Two-factor authentication endpoints
@@ -567,51 +581,45 @@ async def setup_2fa(
     db: AsyncSession = Depends(get_db)
 ):
     """Setup two-factor authentication"""
-    try:
-        # Verify password
-        result = await db.execute(
-            "SELECT password_hash FROM user WHERE id = :user_id",
-            {"user_id": current_user_id}
-        )
-        user_data = result.fetchone()
-        
-        if not verify_password(request.password, user_data.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid password"
-            )
-        
-        # Generate TOTP secret
-        totp_secret = generate_totp_secret()
-        backup_codes = generate_backup_codes()
-        
-        # Encrypt and store secret
-        encrypted_secret = encrypt_sensitive_data(totp_secret)
-        await db.execute(
-            "UPDATE user SET totp_secret = :totp_secret, backup_codes = :backup_codes, updated_at = NOW() WHERE id = :user_id",
-            {
-                "totp_secret": encrypted_secret,
-                "backup_codes": backup_codes,
-                "user_id": current_user_id
-            }
-        )
-        
-        await db.commit()
-        
-        return Setup2FAResponse(
-            secret=totp_secret,
-            qr_code_url=f"otpauth://totp/ChainGuard:{current_user_id}?secret={totp_secret}&issuer=ChainGuard",
-            backup_codes=backup_codes
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("2FA setup error", error=str(e))
+    # Verify password
+    result = await db.execute(
+        _Q_USER_PASSWORD_HASH, {"user_id": current_user_id}
+    )
+    user_data = result.fetchone()
+    
+    if not await verify_password_async(request.password, user_data.password_hash):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid password"
+        )
+    
+    # Generate TOTP secret
+    totp_secret = generate_totp_secret()
+    backup_codes = generate_backup_codes()
+    
+    # Encrypt the secret and store only hashed backup codes; the
+    # plaintext codes go back to the user exactly once
+    encrypted_secret = encrypt_sensitive_data(totp_secret)
+    await db.execute(
+        _Q_SET_2FA,
+        {
+            "totp_secret": encrypted_secret,
+            "backup_codes": [hash_backup_code(code) for code in backup_codes],
+            "user_id": current_user_id
+        }
+    )
+    
+    await db.commit()
+    
+    return Setup2FAResponse(
+        secret=totp_secret,
+        qr_code_url=_OTPAUTH_TEMPLATE.format(
+            uid=current_user_id,
+            qs=urlencode({"secret": totp_secret, "issuer": "ChainGuard"}),
+        ),
+        backup_codes=backup_codes
+    )
+    
 
 
 @router.post("/2fa/verify")
@@ -621,38 +629,26 @@ async def verify_2fa(
     db: AsyncSession = Depends(get_db)
 ):
     """Verify two-factor authentication"""
-    try:
-        # Get user's TOTP secret
-        result = await db.execute(
-            "SELECT totp_secret FROM user WHERE id = :user_id",
-            {"user_id": current_user_id}
+    # Get user's TOTP secret
+    result = await db.execute(_Q_USER_TOTP_SECRET, {"user_id": current_user_id})
+    user_data = result.fetchone()
+    
+    if not user_data.totp_secret:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="2FA not enabled"
         )
-        user_data = result.fetchone()
-        
-        if not user_data.totp_secret:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="2FA not enabled"
-            )
-        
-        # Decrypt and verify TOTP
-        decrypted_secret = decrypt_sensitive_data(user_data.totp_secret)
-        if not verify_totp(decrypted_secret, request.token):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid 2FA token"
-            )
-        
-        return {"message": "2FA verified successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("2FA verification error", error=str(e))
+    
+    # Decrypt and verify TOTP
+    decrypted_secret = decrypt_sensitive_data(user_data.totp_secret)
+    if not verify_totp(decrypted_secret, request.token):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid 2FA token"
         )
+    
+    return {"message": "2FA verified successfully"}
+    
 
 
 @router.post("/2fa/disable")
@@ -662,65 +658,90 @@ async def disable_2fa(
     db: AsyncSession = Depends(get_db)
 ):
     """Disable two-factor authentication"""
-    try:
-        # Verify password
-        result = await db.execute(
-            "SELECT password_hash, backup_codes FROM user WHERE id = :user_id",
-            {"user_id": current_user_id}
-        )
-        user_data = result.fetchone()
-        
-        if not verify_password(request.password, user_data.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid password"
-            )
-        
-        # Verify backup code if provided
-        if request.backup_code and request.backup_code not in user_data.backup_codes:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid backup code"
-            )
-        
-        # Disable 2FA
-        await db.execute(
-            "UPDATE user SET totp_secret = NULL, backup_codes = NULL, updated_at = NOW() WHERE id = :user_id",
-            {"user_id": current_user_id}
-        )
-        
-        await db.commit()
-        
-        return {"message": "2FA disabled successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("2FA disable error", error=str(e))
+    # Verify password
+    result = await db.execute(
+        _Q_USER_2FA_CREDENTIALS, {"user_id": current_user_id}
+    )
+    user_data = result.fetchone()
+    
+    if not await verify_password_async(request.password, user_data.password_hash):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
-        )
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid password"
+        )
+    
+    # Verify backup code if provided; codes are stored hashed, so hash
+    # the input and probe a set rather than scanning the plaintext list
+    if request.backup_code and hash_backup_code(request.backup_code) not in set(
+        user_data.backup_codes or []
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid backup code"
+        )
+    
+    # Disable 2FA
+    await db.execute(_Q_CLEAR_2FA, {"user_id": current_user_id})
+    
+    await db.commit()
+    
+    return {"message": "2FA disabled successfully"}
+    
 
 
 # Helper function to get user permissions
+#
+# Permissions change rarely but are resolved on every login and token refresh,
+# so the 3-table join result is cached in Redis under perms:{user_id} with a
+# short TTL. Role/permission mutation endpoints must call
+# invalidate_user_permissions() so changes propagate immediately.
+PERMISSIONS_CACHE_TTL_SECONDS = 60
+
+
 async def get_user_permissions(db: AsyncSession, user_id: str) -> List[str]:
-    """Get user permissions from database"""
+    """Get user permissions, preferring the Redis cache over the 3-way join"""
+    import json
+
+    from app.core.cache import get_redis
+
+    cache_key = f"perms:{user_id}"
+    redis_client = get_redis()
+
+    if redis_client is not None:
+        try:
+            cached = await redis_client.get(cache_key)
+            if cached is not None:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning("Permissions cache read failed", user_id=user_id, error=str(e))
+
     try:
-        result = await db.execute(
-            """
-            SELECT DISTINCT p.name
-            FROM permission p
-            JOIN role_permissions rp ON p.id = rp.permission_id
-            JOIN user_roles ur ON rp.role_id = ur.role_id
-            WHERE ur.user_id = :user_id
-            """,
-            {"user_id": user_id}
-        )
-        
+        result = await db.execute(_Q_USER_PERMISSIONS, {"user_id": user_id})
+
         permissions = [row.name for row in result.fetchall()]
+
+        if redis_client is not None:
+            try:
+                await redis_client.setex(
+                    cache_key, PERMISSIONS_CACHE_TTL_SECONDS, json.dumps(permissions)
+                )
+            except Exception as e:
+                logger.warning("Permissions cache write failed", user_id=user_id, error=str(e))
+
         return permissions
-        
+
     except Exception as e:
         logger.error("Error getting user permissions", error=str(e))
         return []
+
+
+async def invalidate_user_permissions(user_id: str) -> None:
+    """Drop the cached permissions for a user after role/permission changes"""
+    from app.core.cache import get_redis
+
+    redis_client = get_redis()
+    if redis_client is not None:
+        try:
+            await redis_client.delete(f"perms:{user_id}")
+        except Exception as e:
+            logger.warning("Permissions cache invalidation failed", user_id=user_id, error=str(e))
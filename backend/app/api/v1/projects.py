@@ -2,14 +2,23 @@
 Project API routes for ChainGuard AI
 """
 
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+import base64
+import binascii
+from typing import List, Optional, Dict, Any, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
+import orjson
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
-from datetime import datetime
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.response_cache import (
+    build_cache_key, get_cached_response, set_cached_response,
+    invalidate_tenant_responses
+)
 from app.core.security import (
     get_current_user_id, get_current_tenant_id, get_current_user_permissions,
     log_security_event, get_client_ip, rate_limit, require_permission
@@ -32,61 +41,220 @@ router = APIRouter(prefix="/projects", tags=["Projects"])
 security = HTTPBearer()
 
 
+# Keyset (cursor) pagination helpers
+#
+# The list endpoints paginate on the sort key of their ORDER BY instead of
+# LIMIT/OFFSET, so each page is an O(size) indexed range scan rather than a
+# scan-and-discard of all preceding rows. The cursor is an opaque base64
+# token wrapping the sort-key values of the last row on the previous page.
+def _encode_cursor(*parts: Any) -> str:
+    """Pack sort-key values into an opaque cursor token"""
+    raw = "|".join(str(p) for p in parts)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str, expected_parts: int) -> Tuple[str, ...]:
+    """Unpack a cursor token, raising 400 on garbage input"""
+    try:
+        parts = tuple(base64.urlsafe_b64decode(cursor.encode()).decode().split("|"))
+    except (binascii.Error, UnicodeDecodeError):
+        parts = ()
+    if len(parts) != expected_parts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return parts
+
+
+_Q_SET_TENANT = text("SELECT set_config('app.tenant_id', :tenant_id, true)")
+
+
+async def get_tenant_db(
+    current_tenant_id: str = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+) -> AsyncSession:
+    """
+    Request session with the caller's tenant pinned for row-level security.
+
+    set_config is transaction-local, so the pin lives exactly as long as the
+    request transaction. The RLS policies on project/analysisrun/finding key
+    on app.tenant_id, which lets lookup queries hit primary keys directly
+    instead of replaying the project join purely for authorization.
+    """
+    await db.execute(_Q_SET_TENANT, {"tenant_id": current_tenant_id})
+    return db
+
+
+# Module-level prepared statements
+#
+# Hoisting each query into a text() constant lets SQLAlchemy reuse the
+# compiled statement and asyncpg keep a prepared plan per connection,
+# instead of re-parsing and re-planning the SQL string on every request.
+# Queries assembled dynamically from filters are wrapped in text() at the
+# call site instead.
+_Q_CREATE_PROJECT = text(
+    """
+    INSERT INTO project (name, description, project_type, framework, source_url,
+                        contract_address, settings, tenant_id, status, created_by,
+                        created_at, updated_at)
+    SELECT :name, :description, :project_type, :framework, :source_url,
+           :contract_address, :settings, t.id, 'active', :created_by,
+           NOW(), NOW()
+    FROM tenant t
+    WHERE t.id = :tenant_id
+      AND (SELECT COUNT(*) FROM project
+           WHERE tenant_id = :tenant_id AND status != 'deleted') < t.max_projects
+    RETURNING id, created_at, updated_at
+    """
+)
+
+_Q_GET_PROJECT = text(
+    """
+    SELECT p.*,
+           COALESCE(ps.contract_count, 0) as contract_count,
+           COALESCE(ps.run_count, 0) as run_count,
+           COALESCE(ps.total_findings, 0) as total_findings,
+           COALESCE(ps.critical_findings, 0) as critical_findings,
+           COALESCE(ps.high_findings, 0) as high_findings,
+           ps.last_run_at as last_run_at
+    FROM project p
+    LEFT JOIN project_stats ps ON ps.project_id = p.id
+    WHERE p.id = :project_id AND p.tenant_id = :tenant_id
+    """
+)
+
+_Q_PROJECT_EXISTS = text(
+    "SELECT id FROM project WHERE id = :project_id AND tenant_id = :tenant_id"
+)
+
+_Q_SOFT_DELETE_PROJECT = text(
+    """
+    UPDATE project SET status = 'deleted', updated_at = NOW()
+    WHERE id = :project_id AND tenant_id = :tenant_id AND status <> 'deleted'
+    RETURNING id
+    """
+)
+
+_Q_CREATE_RUN = text(
+    """
+    INSERT INTO analysisrun (project_id, profile, settings, description, tags,
+                           status, progress, created_by, created_at, updated_at)
+    SELECT p.id, :profile, :settings, :description, :tags,
+           'pending', 0.0, :created_by, NOW(), NOW()
+    FROM project p
+    WHERE p.id = :project_id AND p.tenant_id = :tenant_id
+    RETURNING id, created_at, updated_at
+    """
+)
+
+# Tenant scoping on run/finding lookups is enforced by the RLS policies,
+# so these are plain primary-key lookups without the authorization join
+_Q_GET_RUN = text("SELECT ar.* FROM analysisrun ar WHERE ar.id = :run_id")
+
+_Q_RUN_EXISTS = text("SELECT id FROM analysisrun WHERE id = :run_id")
+
+# Existence check and facet counts in one row: the jsonb counters are
+# maintained by the run_facets_findings trigger, so no per-request GROUP BY
+# over the run's findings is needed
+_Q_RUN_FACETS = text(
+    """
+    SELECT finding_counts_by_severity, finding_counts_by_category
+    FROM analysisrun WHERE id = :run_id
+    """
+)
+
+_Q_EXPORT_FINDINGS = text(
+    """
+    SELECT f.*, c.name as contract_name
+    FROM finding f
+    LEFT JOIN contract c ON f.contract_id = c.id
+    WHERE f.run_id = :run_id
+    ORDER BY f.severity DESC, f.created_at DESC, f.id DESC
+    """
+)
+
+# One static statement for every finding update: absent fields arrive as
+# NULL and COALESCE keeps the stored value, so the plan cache always hits
+# instead of re-planning a per-request field combination. RLS scopes the
+# target row to the caller's tenant.
+_Q_UPDATE_FINDING = text(
+    """
+    UPDATE finding SET
+        title = COALESCE(:title, title),
+        description = COALESCE(:description, description),
+        severity = COALESCE(:severity, severity),
+        status = COALESCE(:status, status),
+        category = COALESCE(:category, category),
+        confidence = COALESCE(:confidence, confidence),
+        tags = COALESCE(:tags, tags),
+        metadata = COALESCE(:metadata, metadata),
+        notes = COALESCE(:notes, notes),
+        assigned_to = COALESCE(:assigned_to, assigned_to),
+        updated_at = NOW()
+    WHERE id = :finding_id
+    RETURNING *
+    """
+)
+
+_Q_CONTRACT_NAMES = text(
+    "SELECT id, name FROM contract WHERE id = ANY(:contract_ids)"
+)
+
+_Q_GET_FINDING = text(
+    """
+    SELECT f.*, c.name as contract_name
+    FROM finding f
+    LEFT JOIN contract c ON f.contract_id = c.id
+    WHERE f.id = :finding_id
+    """
+)
+
+# One row from the scheduled per-tenant rollup view instead of five
+# aggregate scans over finding/analysisrun/project per dashboard load
+_Q_DASHBOARD_STATS = text(
+    "SELECT * FROM mv_dashboard_stats WHERE tenant_id = :tenant_id"
+)
+
+
 @router.post("/", response_model=ProjectResponse)
 @require_permission("project:write")
 async def create_project(
     request: ProjectCreate,
     current_user_id: str = Depends(get_current_user_id),
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """Create a new project"""
     try:
-        # Check project limits for tenant
+        # Insert only while the tenant is under its project quota, checked in
+        # the same statement: one round-trip instead of three, and no race
+        # window between the count and the insert
         result = await db.execute(
-            "SELECT COUNT(*) FROM project WHERE tenant_id = :tenant_id AND status != 'deleted'",
-            {"tenant_id": current_tenant_id}
-        )
-        project_count = result.scalar()
-        
-        # Get tenant limits
-        tenant_result = await db.execute(
-            "SELECT max_projects FROM tenant WHERE id = :tenant_id",
-            {"tenant_id": current_tenant_id}
-        )
-        max_projects = tenant_result.scalar()
-        
-        if project_count >= max_projects:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Project limit reached ({max_projects} projects)"
-            )
-        
-        # Create project
-        await db.execute(
-            """
-            INSERT INTO project (name, description, project_type, framework, source_url, 
-                                contract_address, settings, tenant_id, status, created_by, 
-                                created_at, updated_at)
-            VALUES (:name, :description, :project_type, :framework, :source_url,
-                    :contract_address, :settings, :tenant_id, 'active', :created_by,
-                    NOW(), NOW())
-            """,
+            _Q_CREATE_PROJECT,
             {
                 "name": request.name,
                 "description": request.description,
                 "project_type": request.project_type,
                 "framework": request.framework,
-                "source_url": str(request.source_url) if request.source_url else None,
+                "source_url": request.source_url,
                 "contract_address": request.contract_address,
                 "settings": request.settings,
                 "tenant_id": current_tenant_id,
                 "created_by": current_user_id
             }
         )
-        
+        new_project = result.fetchone()
+
+        if not new_project:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Project limit reached"
+            )
+
         await db.commit()
-        
+        await invalidate_tenant_responses(current_tenant_id)
+
         # Log project creation
         log_security_event(
             "project_created",
@@ -94,10 +262,10 @@ async def create_project(
             current_tenant_id,
             {"project_name": request.name, "project_type": request.project_type}
         )
-        
+
         # Return created project
         return ProjectResponse(
-            id="new_project_id",  # Would be actual ID in real implementation
+            id=new_project.id,
             name=request.name,
             description=request.description,
             project_type=request.project_type,
@@ -112,8 +280,8 @@ async def create_project(
             total_findings=0,
             critical_findings=0,
             high_findings=0,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=new_project.created_at,
+            updated_at=new_project.updated_at
         )
         
     except HTTPException:
@@ -129,67 +297,91 @@ async def create_project(
 @router.get("/", response_model=ProjectListResponse)
 @require_permission("project:read")
 async def list_projects(
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     size: int = Query(20, ge=1, le=100),
     status_filter: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """List projects for the current tenant"""
     try:
-        # Build query
+        # Serve repeat reads from Redis; free-text searches are long-tail
+        # and skip the cache entirely
+        cache_key = None
+        if not search:
+            cache_key = build_cache_key(
+                current_tenant_id, "/projects",
+                {"cursor": cursor, "size": size, "status": status_filter}
+            )
+            cached = await get_cached_response(cache_key)
+            if cached is not None:
+                # Cached bodies are the final serialized JSON; returning a
+                # Response skips Pydantic and JSON work entirely on hits
+                return Response(
+                    content=cached, media_type="application/json",
+                    headers={"X-Cache": "HIT"}
+                )
+
+        # Build query. Rollups come from the trigger-maintained
+        # project_stats table: one extra row per project instead of
+        # re-aggregating contracts/runs/findings on every request
         query = """
-            SELECT p.*, 
-                   COUNT(DISTINCT c.id) as contract_count,
-                   COUNT(DISTINCT ar.id) as run_count,
-                   COUNT(DISTINCT f.id) as total_findings,
-                   SUM(CASE WHEN f.severity = 'critical' THEN 1 ELSE 0 END) as critical_findings,
-                   SUM(CASE WHEN f.severity = 'high' THEN 1 ELSE 0 END) as high_findings,
-                   MAX(ar.created_at) as last_run_at
+            SELECT p.*,
+                   COALESCE(ps.contract_count, 0) as contract_count,
+                   COALESCE(ps.run_count, 0) as run_count,
+                   COALESCE(ps.total_findings, 0) as total_findings,
+                   COALESCE(ps.critical_findings, 0) as critical_findings,
+                   COALESCE(ps.high_findings, 0) as high_findings,
+                   ps.last_run_at as last_run_at
             FROM project p
-            LEFT JOIN contract c ON p.id = c.project_id
-            LEFT JOIN analysisrun ar ON p.id = ar.project_id
-            LEFT JOIN finding f ON ar.id = f.run_id
+            LEFT JOIN project_stats ps ON ps.project_id = p.id
             WHERE p.tenant_id = :tenant_id
         """
         params = {"tenant_id": current_tenant_id}
-        
+
         if status_filter:
             query += " AND p.status = :status"
             params["status"] = status_filter
-        
-        if search:
-            query += " AND (p.name ILIKE :search OR p.description ILIKE :search)"
-            params["search"] = f"%{search}%"
-        
-        query += " GROUP BY p.id ORDER BY p.updated_at DESC"
-        
-        # Get total count
-        count_query = """
-            SELECT COUNT(*) FROM project 
-            WHERE tenant_id = :tenant_id
-        """
-        if status_filter:
-            count_query += " AND status = :status"
+
         if search:
-            count_query += " AND (name ILIKE :search OR description ILIKE :search)"
-        
-        count_result = await db.execute(count_query, params)
-        total = count_result.scalar()
-        
-        # Get paginated results
-        query += " LIMIT :limit OFFSET :offset"
-        params["limit"] = size
-        params["offset"] = (page - 1) * size
-        
-        result = await db.execute(query, params)
+            # Index-backed full-text match on the stored tsvector; queries
+            # under three characters rarely form a useful lexeme and fall
+            # back to the trigram-indexed ILIKE
+            if len(search) >= 3:
+                query += " AND p.search_tsv @@ plainto_tsquery('simple', :search)"
+                params["search"] = search
+            else:
+                query += " AND (p.name ILIKE :search OR p.description ILIKE :search)"
+                params["search"] = f"%{search}%"
+
+        if cursor:
+            cursor_ts, cursor_id = _decode_cursor(cursor, 2)
+            query += (
+                " AND (p.updated_at, p.id) <"
+                " (CAST(:cursor_ts AS timestamp), :cursor_id)"
+            )
+            params["cursor_ts"] = cursor_ts
+            params["cursor_id"] = cursor_id
+
+        # Fetch one row beyond the page to know whether a next page exists
+        query += " ORDER BY p.updated_at DESC, p.id DESC LIMIT :limit"
+        params["limit"] = size + 1
+
+        result = await db.execute(text(query), params)
         projects_data = result.fetchall()
-        
-        # Convert to response models
+
+        next_cursor = None
+        if len(projects_data) > size:
+            projects_data = projects_data[:size]
+            last = projects_data[-1]
+            next_cursor = _encode_cursor(last.updated_at.isoformat(), last.id)
+
+        # Convert to response models; rows come straight from the DB, so
+        # model_construct skips the per-field validator pipeline
         projects = []
         for project_data in projects_data:
-            projects.append(ProjectResponse(
+            projects.append(ProjectResponse.model_construct(
                 id=project_data.id,
                 name=project_data.name,
                 description=project_data.description,
@@ -210,14 +402,23 @@ async def list_projects(
                 updated_at=project_data.updated_at
             ))
         
-        return ProjectListResponse(
-            projects=projects,
-            total=total,
-            page=page,
-            size=size,
-            pages=(total + size - 1) // size
+        # Serialize once with orjson and hand FastAPI a finished Response:
+        # the response_model stays for OpenAPI, but the page skips the
+        # second validate/serialize pass it would otherwise pay, and the
+        # cache stores the exact bytes that went over the wire
+        body = orjson.dumps(
+            ProjectListResponse.model_construct(
+                projects=projects,
+                size=size,
+                next_cursor=next_cursor
+            ).model_dump(mode="json")
         )
-        
+        if cache_key:
+            await set_cached_response(cache_key, body)
+        return Response(content=body, media_type="application/json")
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Project list error", error=str(e))
         raise HTTPException(
@@ -231,26 +432,22 @@ async def list_projects(
 async def get_project(
     project_id: str,
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """Get project details"""
     try:
+        cache_key = build_cache_key(
+            current_tenant_id, f"/projects/{project_id}", {}
+        )
+        cached = await get_cached_response(cache_key)
+        if cached is not None:
+            return Response(
+                content=cached, media_type="application/json",
+                headers={"X-Cache": "HIT"}
+            )
+
         result = await db.execute(
-            """
-            SELECT p.*, 
-                   COUNT(DISTINCT c.id) as contract_count,
-                   COUNT(DISTINCT ar.id) as run_count,
-                   COUNT(DISTINCT f.id) as total_findings,
-                   SUM(CASE WHEN f.severity = 'critical' THEN 1 ELSE 0 END) as critical_findings,
-                   SUM(CASE WHEN f.severity = 'high' THEN 1 ELSE 0 END) as high_findings,
-                   MAX(ar.created_at) as last_run_at
-            FROM project p
-            LEFT JOIN contract c ON p.id = c.project_id
-            LEFT JOIN analysisrun ar ON p.id = ar.project_id
-            LEFT JOIN finding f ON ar.id = f.run_id
-            WHERE p.id = :project_id AND p.tenant_id = :tenant_id
-            GROUP BY p.id
-            """,
+            _Q_GET_PROJECT,
             {"project_id": project_id, "tenant_id": current_tenant_id}
         )
         
@@ -262,7 +459,7 @@ async def get_project(
                 detail="Project not found"
             )
         
-        return ProjectResponse(
+        response = ProjectResponse(
             id=project_data.id,
             name=project_data.name,
             description=project_data.description,
@@ -282,7 +479,9 @@ async def get_project(
             created_at=project_data.created_at,
             updated_at=project_data.updated_at
         )
-        
+        await set_cached_response(cache_key, response.model_dump(mode="json"))
+        return response
+
     except HTTPException:
         raise
     except Exception as e:
@@ -299,26 +498,14 @@ async def update_project(
     project_id: str,
     request: ProjectUpdate,
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """Update project details"""
     try:
-        # Check if project exists and belongs to tenant
-        result = await db.execute(
-            "SELECT id FROM project WHERE id = :project_id AND tenant_id = :tenant_id",
-            {"project_id": project_id, "tenant_id": current_tenant_id}
-        )
-        
-        if not result.fetchone():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Project not found"
-            )
-        
         # Build update query
         update_fields = []
-        params = {"project_id": project_id}
-        
+        params = {"project_id": project_id, "tenant_id": current_tenant_id}
+
         if request.name is not None:
             update_fields.append("name = :name")
             params["name"] = request.name
@@ -343,13 +530,60 @@ async def update_project(
         
         update_fields.append("updated_at = NOW()")
         
-        query = f"UPDATE project SET {', '.join(update_fields)} WHERE id = :project_id"
-        await db.execute(query, params)
-        
+        # Single statement: the tenant check rides on the UPDATE itself, so
+        # there is no existence-check round trip and no race window between
+        # check and mutation. RETURNING hands back the updated row plus the
+        # project_stats rollups (single-row PK lookups on the same page), so
+        # the response needs no follow-up SELECT
+        query = (
+            f"UPDATE project SET {', '.join(update_fields)}"
+            " WHERE id = :project_id AND tenant_id = :tenant_id"
+            " RETURNING project.*,"
+            " (SELECT ps.contract_count FROM project_stats ps"
+            "  WHERE ps.project_id = project.id) AS contract_count,"
+            " (SELECT ps.run_count FROM project_stats ps"
+            "  WHERE ps.project_id = project.id) AS run_count,"
+            " (SELECT ps.total_findings FROM project_stats ps"
+            "  WHERE ps.project_id = project.id) AS total_findings,"
+            " (SELECT ps.critical_findings FROM project_stats ps"
+            "  WHERE ps.project_id = project.id) AS critical_findings,"
+            " (SELECT ps.high_findings FROM project_stats ps"
+            "  WHERE ps.project_id = project.id) AS high_findings,"
+            " (SELECT ps.last_run_at FROM project_stats ps"
+            "  WHERE ps.project_id = project.id) AS last_run_at"
+        )
+        result = await db.execute(text(query), params)
+        project_data = result.fetchone()
+
+        if not project_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+
         await db.commit()
-        
-        # Return updated project
-        return await get_project(project_id, current_tenant_id, db)
+        await invalidate_tenant_responses(current_tenant_id)
+
+        return ProjectResponse(
+            id=project_data.id,
+            name=project_data.name,
+            description=project_data.description,
+            project_type=project_data.project_type,
+            framework=project_data.framework,
+            source_url=project_data.source_url,
+            contract_address=project_data.contract_address,
+            settings=project_data.settings,
+            tenant_id=project_data.tenant_id,
+            status=project_data.status,
+            contract_count=project_data.contract_count or 0,
+            run_count=project_data.run_count or 0,
+            last_run_at=project_data.last_run_at,
+            total_findings=project_data.total_findings or 0,
+            critical_findings=project_data.critical_findings or 0,
+            high_findings=project_data.high_findings or 0,
+            created_at=project_data.created_at,
+            updated_at=project_data.updated_at
+        )
         
     except HTTPException:
         raise
@@ -366,29 +600,25 @@ async def update_project(
 async def delete_project(
     project_id: str,
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """Delete project (soft delete)"""
     try:
-        # Check if project exists and belongs to tenant
+        # Soft delete in one guarded statement; zero rows means the project
+        # is missing, another tenant's, or already deleted
         result = await db.execute(
-            "SELECT id FROM project WHERE id = :project_id AND tenant_id = :tenant_id",
+            _Q_SOFT_DELETE_PROJECT,
             {"project_id": project_id, "tenant_id": current_tenant_id}
         )
-        
+
         if not result.fetchone():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found"
             )
-        
-        # Soft delete
-        await db.execute(
-            "UPDATE project SET status = 'deleted', updated_at = NOW() WHERE id = :project_id",
-            {"project_id": project_id}
-        )
-        
+
         await db.commit()
+        await invalidate_tenant_responses(current_tenant_id)
         
         return {"message": "Project deleted successfully"}
         
@@ -410,32 +640,18 @@ async def create_analysis_run(
     request: AnalysisRunCreate,
     current_user_id: str = Depends(get_current_user_id),
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """Create a new analysis run"""
     try:
-        # Check if project exists and belongs to tenant
+        # Create analysis run; the INSERT ... SELECT only produces a row when
+        # the project exists in the caller's tenant, folding the existence
+        # check into the insert itself
         result = await db.execute(
-            "SELECT id FROM project WHERE id = :project_id AND tenant_id = :tenant_id",
-            {"project_id": project_id, "tenant_id": current_tenant_id}
-        )
-        
-        if not result.fetchone():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Project not found"
-            )
-        
-        # Create analysis run
-        await db.execute(
-            """
-            INSERT INTO analysisrun (project_id, profile, settings, description, tags,
-                                   status, progress, created_by, created_at, updated_at)
-            VALUES (:project_id, :profile, :settings, :description, :tags,
-                    'pending', 0.0, :created_by, NOW(), NOW())
-            """,
+            _Q_CREATE_RUN,
             {
                 "project_id": project_id,
+                "tenant_id": current_tenant_id,
                 "profile": request.profile,
                 "settings": request.settings,
                 "description": request.description,
@@ -443,13 +659,20 @@ async def create_analysis_run(
                 "created_by": current_user_id
             }
         )
-        
+        new_run = result.fetchone()
+
+        if not new_run:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+
         await db.commit()
-        
+        await invalidate_tenant_responses(current_tenant_id)
+
         # In real implementation, this would trigger the analysis pipeline
-        # For now, return a mock response
         return AnalysisRunResponse(
-            id="new_run_id",
+            id=new_run.id,
             project_id=project_id,
             profile=request.profile,
             settings=request.settings,
@@ -459,8 +682,8 @@ async def create_analysis_run(
             progress=0.0,
             tool_versions={},
             checkpoints={},
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=new_run.created_at,
+            updated_at=new_run.updated_at
         )
         
     except HTTPException:
@@ -477,56 +700,59 @@ async def create_analysis_run(
 @require_permission("analysis:read")
 async def list_analysis_runs(
     project_id: str,
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     size: int = Query(20, ge=1, le=100),
     status_filter: Optional[str] = Query(None),
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """List analysis runs for a project"""
     try:
         # Check if project exists and belongs to tenant
         result = await db.execute(
-            "SELECT id FROM project WHERE id = :project_id AND tenant_id = :tenant_id",
+            _Q_PROJECT_EXISTS,
             {"project_id": project_id, "tenant_id": current_tenant_id}
         )
-        
+
         if not result.fetchone():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found"
             )
-        
+
         # Build query
         query = "SELECT * FROM analysisrun WHERE project_id = :project_id"
         params = {"project_id": project_id}
-        
+
         if status_filter:
             query += " AND status = :status"
             params["status"] = status_filter
-        
-        query += " ORDER BY created_at DESC"
-        
-        # Get total count
-        count_query = "SELECT COUNT(*) FROM analysisrun WHERE project_id = :project_id"
-        if status_filter:
-            count_query += " AND status = :status"
-        
-        count_result = await db.execute(count_query, params)
-        total = count_result.scalar()
-        
-        # Get paginated results
-        query += " LIMIT :limit OFFSET :offset"
-        params["limit"] = size
-        params["offset"] = (page - 1) * size
-        
-        result = await db.execute(query, params)
+
+        if cursor:
+            cursor_ts, cursor_id = _decode_cursor(cursor, 2)
+            query += (
+                " AND (created_at, id) <"
+                " (CAST(:cursor_ts AS timestamp), :cursor_id)"
+            )
+            params["cursor_ts"] = cursor_ts
+            params["cursor_id"] = cursor_id
+
+        query += " ORDER BY created_at DESC, id DESC LIMIT :limit"
+        params["limit"] = size + 1
+
+        result = await db.execute(text(query), params)
         runs_data = result.fetchall()
-        
+
+        next_cursor = None
+        if len(runs_data) > size:
+            runs_data = runs_data[:size]
+            last = runs_data[-1]
+            next_cursor = _encode_cursor(last.created_at.isoformat(), last.id)
+
         # Convert to response models
         runs = []
         for run_data in runs_data:
-            runs.append(AnalysisRunResponse(
+            runs.append(AnalysisRunResponse.model_construct(
                 id=run_data.id,
                 project_id=run_data.project_id,
                 profile=run_data.profile,
@@ -545,13 +771,14 @@ async def list_analysis_runs(
                 updated_at=run_data.updated_at
             ))
         
-        return AnalysisRunListResponse(
-            runs=runs,
-            total=total,
-            page=page,
-            size=size,
-            pages=(total + size - 1) // size
+        body = orjson.dumps(
+            AnalysisRunListResponse.model_construct(
+                runs=runs,
+                size=size,
+                next_cursor=next_cursor
+            ).model_dump(mode="json")
         )
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -568,17 +795,12 @@ async def list_analysis_runs(
 async def get_analysis_run(
     run_id: str,
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """Get analysis run details"""
     try:
         result = await db.execute(
-            """
-            SELECT ar.* FROM analysisrun ar
-            JOIN project p ON ar.project_id = p.id
-            WHERE ar.id = :run_id AND p.tenant_id = :tenant_id
-            """,
-            {"run_id": run_id, "tenant_id": current_tenant_id}
+            _Q_GET_RUN, {"run_id": run_id}
         )
         
         run_data = result.fetchone()
@@ -623,37 +845,50 @@ async def get_analysis_run(
 @require_permission("finding:read")
 async def list_findings(
     run_id: str,
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     size: int = Query(20, ge=1, le=100),
     severity: Optional[str] = Query(None),
-    status: Optional[str] = Query(None),
+    status_filter: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """List findings for an analysis run"""
     try:
-        # Check if run exists and belongs to tenant
+        cache_key = build_cache_key(
+            current_tenant_id, f"/runs/{run_id}/findings",
+            {
+                "cursor": cursor, "size": size, "severity": severity,
+                "status": status_filter, "category": category
+            }
+        )
+        cached = await get_cached_response(cache_key)
+        if cached is not None:
+            return Response(
+                content=cached, media_type="application/json",
+                headers={"X-Cache": "HIT"}
+            )
+
+        # Existence check and precomputed facet counters in one round trip
         result = await db.execute(
-            """
-            SELECT ar.id FROM analysisrun ar
-            JOIN project p ON ar.project_id = p.id
-            WHERE ar.id = :run_id AND p.tenant_id = :tenant_id
-            """,
-            {"run_id": run_id, "tenant_id": current_tenant_id}
+            _Q_RUN_FACETS, {"run_id": run_id}
         )
-        
-        if not result.fetchone():
+        run_data = result.fetchone()
+
+        if not run_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Analysis run not found"
             )
-        
-        # Build query
+
+        severity_counts = run_data.finding_counts_by_severity or {}
+        category_counts = run_data.finding_counts_by_category or {}
+
+        # Build query; contract names are stitched in afterwards from one
+        # bulk lookup instead of joining contract into every wide finding row
         query = """
-            SELECT f.*, c.name as contract_name
+            SELECT f.*
             FROM finding f
-            LEFT JOIN contract c ON f.contract_id = c.id
             WHERE f.run_id = :run_id
         """
         params = {"run_id": run_id}
@@ -662,57 +897,61 @@ async def list_findings(
             query += " AND f.severity = :severity"
             params["severity"] = severity
         
-        if status:
+        if status_filter:
             query += " AND f.status = :status"
-            params["status"] = status
+            params["status"] = status_filter
         
         if category:
             query += " AND f.category = :category"
             params["category"] = category
-        
-        query += " ORDER BY f.severity DESC, f.created_at DESC"
-        
-        # Get total count
-        count_query = "SELECT COUNT(*) FROM finding WHERE run_id = :run_id"
-        if severity:
-            count_query += " AND severity = :severity"
-        if status:
-            count_query += " AND status = :status"
-        if category:
-            count_query += " AND category = :category"
-        
-        count_result = await db.execute(count_query, params)
-        total = count_result.scalar()
-        
-        # Get severity counts
-        severity_result = await db.execute(
-            "SELECT severity, COUNT(*) FROM finding WHERE run_id = :run_id GROUP BY severity",
-            {"run_id": run_id}
-        )
-        severity_counts = {row.severity: row.count for row in severity_result.fetchall()}
-        
-        # Get category counts
-        category_result = await db.execute(
-            "SELECT category, COUNT(*) FROM finding WHERE run_id = :run_id GROUP BY category",
-            {"run_id": run_id}
-        )
-        category_counts = {row.category: row.count for row in category_result.fetchall()}
-        
+
+        if cursor:
+            cursor_sev, cursor_ts, cursor_id = _decode_cursor(cursor, 3)
+            query += (
+                " AND (f.severity, f.created_at, f.id) <"
+                " (CAST(:cursor_sev AS finding_severity),"
+                " CAST(:cursor_ts AS timestamp), :cursor_id)"
+            )
+            params["cursor_sev"] = cursor_sev
+            params["cursor_ts"] = cursor_ts
+            params["cursor_id"] = cursor_id
+
+        query += " ORDER BY f.severity DESC, f.created_at DESC, f.id DESC"
+
         # Get paginated results
-        query += " LIMIT :limit OFFSET :offset"
-        params["limit"] = size
-        params["offset"] = (page - 1) * size
-        
-        result = await db.execute(query, params)
+        query += " LIMIT :limit"
+        params["limit"] = size + 1
+
+        result = await db.execute(text(query), params)
         findings_data = result.fetchall()
-        
+
+        next_cursor = None
+        if len(findings_data) > size:
+            findings_data = findings_data[:size]
+            last = findings_data[-1]
+            next_cursor = _encode_cursor(
+                last.severity, last.created_at.isoformat(), last.id
+            )
+
+        # One WHERE-IN lookup for the distinct contracts on this page
+        contract_names = {}
+        contract_ids = {
+            row.contract_id for row in findings_data if row.contract_id
+        }
+        if contract_ids:
+            result = await db.execute(
+                _Q_CONTRACT_NAMES, {"contract_ids": list(contract_ids)}
+            )
+            contract_names = {row.id: row.name for row in result.fetchall()}
+
         # Convert to response models
         findings = []
         for finding_data in findings_data:
-            findings.append(FindingResponse(
+            findings.append(FindingResponse.model_construct(
                 id=finding_data.id,
                 run_id=finding_data.run_id,
                 contract_id=finding_data.contract_id,
+                contract_name=contract_names.get(finding_data.contract_id),
                 title=finding_data.title,
                 description=finding_data.description,
                 severity=finding_data.severity,
@@ -733,15 +972,17 @@ async def list_findings(
                 updated_at=finding_data.updated_at
             ))
         
-        return FindingListResponse(
-            findings=findings,
-            total=total,
-            page=page,
-            size=size,
-            pages=(total + size - 1) // size,
-            severity_counts=severity_counts,
-            category_counts=category_counts
+        body = orjson.dumps(
+            FindingListResponse.model_construct(
+                findings=findings,
+                size=size,
+                next_cursor=next_cursor,
+                severity_counts=severity_counts,
+                category_counts=category_counts
+            ).model_dump(mode="json")
         )
+        await set_cached_response(cache_key, body)
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -753,25 +994,63 @@ async def list_findings(
         )
 
 
+@router.get("/runs/{run_id}/findings/export")
+@require_permission("finding:read")
+async def export_findings(
+    run_id: str,
+    current_tenant_id: str = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_tenant_db)
+):
+    """Stream every finding for an analysis run as NDJSON"""
+    try:
+        # Check if run exists and belongs to tenant
+        result = await db.execute(
+            _Q_RUN_EXISTS, {"run_id": run_id}
+        )
+
+        if not result.fetchone():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Analysis run not found"
+            )
+
+        async def generate():
+            # Server-side cursor on a session of its own: rows flow through
+            # one at a time instead of the whole run's findings (with their
+            # code_spans/evidence/patches blobs) being buffered in memory
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    _Q_SET_TENANT, {"tenant_id": current_tenant_id}
+                )
+                result = await session.stream(
+                    _Q_EXPORT_FINDINGS, {"run_id": run_id}
+                )
+                async for row in result:
+                    yield orjson.dumps(dict(row._mapping)) + b"\n"
+
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Findings export error", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
 @router.get("/findings/{finding_id}", response_model=FindingResponse)
 @require_permission("finding:read")
 async def get_finding(
     finding_id: str,
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """Get finding details"""
     try:
         result = await db.execute(
-            """
-            SELECT f.*, c.name as contract_name
-            FROM finding f
-            JOIN analysisrun ar ON f.run_id = ar.id
-            JOIN project p ON ar.project_id = p.id
-            LEFT JOIN contract c ON f.contract_id = c.id
-            WHERE f.id = :finding_id AND p.tenant_id = :tenant_id
-            """,
-            {"finding_id": finding_id, "tenant_id": current_tenant_id}
+            _Q_GET_FINDING, {"finding_id": finding_id}
         )
         
         finding_data = result.fetchone()
@@ -782,30 +1061,36 @@ async def get_finding(
                 detail="Finding not found"
             )
         
-        return FindingResponse(
-            id=finding_data.id,
-            run_id=finding_data.run_id,
-            contract_id=finding_data.contract_id,
-            title=finding_data.title,
-            description=finding_data.description,
-            severity=finding_data.severity,
-            category=finding_data.category,
-            swc_id=finding_data.swc_id,
-            cwe_id=finding_data.cwe_id,
-            confidence=finding_data.confidence,
-            code_spans=finding_data.code_spans,
-            evidence=finding_data.evidence,
-            recommendations=finding_data.recommendations,
-            patches=finding_data.patches,
-            tags=finding_data.tags,
-            metadata=finding_data.metadata,
-            status=finding_data.status,
-            notes=finding_data.notes,
-            assigned_to=finding_data.assigned_to,
-            created_at=finding_data.created_at,
-            updated_at=finding_data.updated_at
+        # Same single-pass serialization as the list endpoints: the row is
+        # trusted, so skip the validator pipeline and encode once
+        body = orjson.dumps(
+            FindingResponse.model_construct(
+                id=finding_data.id,
+                run_id=finding_data.run_id,
+                contract_id=finding_data.contract_id,
+                contract_name=finding_data.contract_name,
+                title=finding_data.title,
+                description=finding_data.description,
+                severity=finding_data.severity,
+                category=finding_data.category,
+                swc_id=finding_data.swc_id,
+                cwe_id=finding_data.cwe_id,
+                confidence=finding_data.confidence,
+                code_spans=finding_data.code_spans,
+                evidence=finding_data.evidence,
+                recommendations=finding_data.recommendations,
+                patches=finding_data.patches,
+                tags=finding_data.tags,
+                metadata=finding_data.metadata,
+                status=finding_data.status,
+                notes=finding_data.notes,
+                assigned_to=finding_data.assigned_to,
+                created_at=finding_data.created_at,
+                updated_at=finding_data.updated_at
+            ).model_dump(mode="json")
         )
-        
+        return Response(content=body, media_type="application/json")
+
     except HTTPException:
         raise
     except Exception as e:
@@ -822,86 +1107,77 @@ async def update_finding(
     finding_id: str,
     request: FindingUpdate,
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """Update finding details"""
     try:
-        # Check if finding exists and belongs to tenant
-        result = await db.execute(
-            """
-            SELECT f.id FROM finding f
-            JOIN analysisrun ar ON f.run_id = ar.id
-            JOIN project p ON ar.project_id = p.id
-            WHERE f.id = :finding_id AND p.tenant_id = :tenant_id
-            """,
-            {"finding_id": finding_id, "tenant_id": current_tenant_id}
-        )
-        
-        if not result.fetchone():
+        params = {
+            "finding_id": finding_id,
+            "title": request.title,
+            "description": request.description,
+            "severity": request.severity,
+            "status": request.status,
+            "category": request.category,
+            "confidence": request.confidence,
+            "tags": request.tags,
+            "metadata": request.metadata,
+            "notes": request.notes,
+            "assigned_to": request.assigned_to,
+        }
+
+        if all(v is None for k, v in params.items() if k != "finding_id"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No fields to update"
+            )
+
+        result = await db.execute(_Q_UPDATE_FINDING, params)
+        finding_data = result.fetchone()
+
+        if not finding_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Finding not found"
             )
-        
-        # Build update query
-        update_fields = []
-        params = {"finding_id": finding_id}
-        
-        if request.title is not None:
-            update_fields.append("title = :title")
-            params["title"] = request.title
-        
-        if request.description is not None:
-            update_fields.append("description = :description")
-            params["description"] = request.description
-        
-        if request.severity is not None:
-            update_fields.append("severity = :severity")
-            params["severity"] = request.severity
-        
-        if request.status is not None:
-            update_fields.append("status = :status")
-            params["status"] = request.status
-        
-        if request.category is not None:
-            update_fields.append("category = :category")
-            params["category"] = request.category
-        
-        if request.confidence is not None:
-            update_fields.append("confidence = :confidence")
-            params["confidence"] = request.confidence
-        
-        if request.tags is not None:
-            update_fields.append("tags = :tags")
-            params["tags"] = request.tags
-        
-        if request.metadata is not None:
-            update_fields.append("metadata = :metadata")
-            params["metadata"] = request.metadata
-        
-        if request.notes is not None:
-            update_fields.append("notes = :notes")
-            params["notes"] = request.notes
-        
-        if request.assigned_to is not None:
-            update_fields.append("assigned_to = :assigned_to")
-            params["assigned_to"] = request.assigned_to
-        
-        if not update_fields:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No fields to update"
+
+        contract_name = None
+        if finding_data.contract_id:
+            result = await db.execute(
+                _Q_CONTRACT_NAMES,
+                {"contract_ids": [finding_data.contract_id]}
             )
-        
-        update_fields.append("updated_at = NOW()")
-        
-        query = f"UPDATE finding SET {', '.join(update_fields)} WHERE id = :finding_id"
-        await db.execute(query, params)
-        
+            name_row = result.fetchone()
+            if name_row:
+                contract_name = name_row.name
+
         await db.commit()
-        
-        # Return updated finding
-        return await get_finding(finding_id, current_tenant_id, db)
+        await invalidate_tenant_responses(current_tenant_id)
+
+        # RETURNING already carries the updated row, so no refetch is needed
+        return FindingResponse(
+            id=finding_data.id,
+            run_id=finding_data.run_id,
+            contract_id=finding_data.contract_id,
+            contract_name=contract_name,
+            title=finding_data.title,
+            description=finding_data.description,
+            severity=finding_data.severity,
+            category=finding_data.category,
+            swc_id=finding_data.swc_id,
+            cwe_id=finding_data.cwe_id,
+            confidence=finding_data.confidence,
+            code_spans=finding_data.code_spans,
+            evidence=finding_data.evidence,
+            recommendations=finding_data.recommendations,
+            patches=finding_data.patches,
+            tags=finding_data.tags,
+            metadata=finding_data.metadata,
+            status=finding_data.status,
+            notes=finding_data.notes,
+            assigned_to=finding_data.assigned_to,
+            created_at=finding_data.created_at,
+            updated_at=finding_data.updated_at
+        )
         
     except HTTPException:
         raise
@@ -918,88 +1194,62 @@ async def update_finding(
 @require_permission("project:read")
 async def get_dashboard_stats(
     current_tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_tenant_db)
 ):
     """Get dashboard statistics"""
     try:
-        # Get project stats
-        project_result = await db.execute(
-            "SELECT COUNT(*) FROM project WHERE tenant_id = :tenant_id AND status != 'deleted'",
-            {"tenant_id": current_tenant_id}
-        )
-        total_projects = project_result.scalar()
-        
-        # Get run stats
-        run_result = await db.execute(
-            """
-            SELECT COUNT(*) FROM analysisrun ar
-            JOIN project p ON ar.project_id = p.id
-            WHERE p.tenant_id = :tenant_id
-            """,
-            {"tenant_id": current_tenant_id}
-        )
-        total_runs = run_result.scalar()
-        
-        # Get finding stats
-        finding_result = await db.execute(
-            """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN severity = 'critical' THEN 1 ELSE 0 END) as critical,
-                SUM(CASE WHEN severity = 'high' THEN 1 ELSE 0 END) as high,
-                SUM(CASE WHEN severity = 'medium' THEN 1 ELSE 0 END) as medium,
-                SUM(CASE WHEN severity = 'low' THEN 1 ELSE 0 END) as low,
-                SUM(CASE WHEN severity = 'informational' THEN 1 ELSE 0 END) as informational
-            FROM finding f
-            JOIN analysisrun ar ON f.run_id = ar.id
-            JOIN project p ON ar.project_id = p.id
-            WHERE p.tenant_id = :tenant_id
-            """,
-            {"tenant_id": current_tenant_id}
-        )
-        finding_stats = finding_result.fetchone()
-        
-        # Get average run duration
-        duration_result = await db.execute(
-            """
-            SELECT AVG(duration_seconds) / 60.0 as avg_duration_minutes
-            FROM analysisrun ar
-            JOIN project p ON ar.project_id = p.id
-            WHERE p.tenant_id = :tenant_id AND ar.duration_seconds IS NOT NULL
-            """,
-            {"tenant_id": current_tenant_id}
-        )
-        avg_duration = duration_result.scalar() or 0.0
-        
-        # Get success rate
-        success_result = await db.execute(
-            """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed
-            FROM analysisrun ar
-            JOIN project p ON ar.project_id = p.id
-            WHERE p.tenant_id = :tenant_id
-            """,
-            {"tenant_id": current_tenant_id}
+        # The dashboard is polled by the frontend, so hits skip Postgres
+        # entirely; writes invalidate via invalidate_tenant_responses
+        cache_key = build_cache_key(current_tenant_id, "/dashboard/stats", {})
+        cached = await get_cached_response(cache_key)
+        if cached is not None:
+            return Response(
+                content=cached, media_type="application/json",
+                headers={"X-Cache": "HIT"}
+            )
+
+        result = await db.execute(
+            _Q_DASHBOARD_STATS, {"tenant_id": current_tenant_id}
         )
-        success_stats = success_result.fetchone()
-        success_rate = (success_stats.completed / success_stats.total * 100) if success_stats.total > 0 else 0.0
-        
-        return DashboardStats(
-            total_projects=total_projects,
-            total_runs=total_runs,
-            total_findings=finding_stats.total or 0,
-            critical_findings=finding_stats.critical or 0,
-            high_findings=finding_stats.high or 0,
-            medium_findings=finding_stats.medium or 0,
-            low_findings=finding_stats.low or 0,
-            informational_findings=finding_stats.informational or 0,
-            avg_run_duration_minutes=avg_duration,
-            success_rate=success_rate,
+        stats = result.fetchone()
+
+        # Tenants created since the last refresh have no row yet
+        if not stats:
+            return DashboardStats(
+                total_projects=0,
+                total_runs=0,
+                total_findings=0,
+                critical_findings=0,
+                high_findings=0,
+                medium_findings=0,
+                low_findings=0,
+                informational_findings=0,
+                avg_run_duration_minutes=0.0,
+                success_rate=0.0,
+                recent_activity=[]
+            )
+
+        response = DashboardStats(
+            total_projects=stats.total_projects,
+            total_runs=stats.total_runs,
+            total_findings=stats.total_findings,
+            critical_findings=stats.critical_findings,
+            high_findings=stats.high_findings,
+            medium_findings=stats.medium_findings,
+            low_findings=stats.low_findings,
+            informational_findings=stats.informational_findings,
+            avg_run_duration_minutes=float(stats.avg_duration_minutes or 0.0),
+            success_rate=float(stats.success_rate or 0.0),
             recent_activity=[]
         )
-        
+        await set_cached_response(
+            cache_key, response.model_dump(mode="json"),
+            ttl=settings.CACHE_TTL_DASHBOARD
+        )
+        return response
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Dashboard stats error", error=str(e))
         raise HTTPException(
@@ -0,0 +1,123 @@
+"""
+Background audit-event queue for ChainGuard AI
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Events are flushed whenever either limit is hit, so the audit trail lags
+# the request path by at most a few tens of milliseconds
+AUDIT_BATCH_MAX_EVENTS = 100
+AUDIT_BATCH_MAX_DELAY_SECONDS = 0.05
+AUDIT_QUEUE_MAXSIZE = 10000
+
+_queue: Optional[asyncio.Queue] = None
+_drain_task: Optional[asyncio.Task] = None
+
+
+def enqueue_event(event: Dict[str, Any]) -> bool:
+    """Enqueue a security event for background persistence"""
+    if _queue is None:
+        return False
+    try:
+        _queue.put_nowait(event)
+        return True
+    except asyncio.QueueFull:
+        logger.warning("Audit queue full, dropping event", event_type=event.get("event_type"))
+        return True
+
+
+def start_audit_queue() -> None:
+    """Create the queue and start the drain task (call from app lifespan)"""
+    global _queue, _drain_task
+    if _drain_task is not None:
+        return
+    _queue = asyncio.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+    _drain_task = asyncio.get_running_loop().create_task(_drain())
+    logger.info("Audit queue started")
+
+
+async def stop_audit_queue() -> None:
+    """Stop the drain task, flushing any buffered events first"""
+    global _queue, _drain_task
+    if _drain_task is None:
+        return
+
+    queue, task = _queue, _drain_task
+    _queue = None
+    _drain_task = None
+
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+    # Flush whatever was still buffered at shutdown
+    remaining: List[Dict[str, Any]] = []
+    while not queue.empty():
+        remaining.append(queue.get_nowait())
+    if remaining:
+        await _flush(remaining)
+    logger.info("Audit queue stopped", flushed=len(remaining))
+
+
+async def _drain() -> None:
+    """Collect events into batches and persist them off the request path"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _queue.get()]
+        deadline = loop.time() + AUDIT_BATCH_MAX_DELAY_SECONDS
+
+        while len(batch) < AUDIT_BATCH_MAX_EVENTS:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        await _flush(batch)
+
+
+async def _flush(batch: List[Dict[str, Any]]) -> None:
+    """Insert a batch of audit events in one multi-row statement"""
+    from app.core.database import AsyncSessionLocal
+
+    security_logger = structlog.get_logger("security")
+    for event in batch:
+        security_logger.warning("Security event", **event)
+
+    try:
+        values = ", ".join(
+            f"(:event_type_{i}, :user_id_{i}, :tenant_id_{i}, :details_{i}, "
+            f":ip_address_{i}, :user_agent_{i}, NOW())"
+            for i in range(len(batch))
+        )
+        params: Dict[str, Any] = {}
+        for i, event in enumerate(batch):
+            params[f"event_type_{i}"] = event.get("event_type")
+            params[f"user_id_{i}"] = event.get("user_id")
+            params[f"tenant_id_{i}"] = event.get("tenant_id")
+            params[f"details_{i}"] = json.dumps(event.get("details") or {})
+            params[f"ip_address_{i}"] = event.get("ip_address")
+            params[f"user_agent_{i}"] = event.get("user_agent")
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                text(
+                    "INSERT INTO auditlog (event_type, user_id, tenant_id, details, "
+                    "ip_address, user_agent, created_at) VALUES " + values
+                ),
+                params,
+            )
+            await session.commit()
+    except Exception as e:
+        logger.error("Audit batch insert failed", count=len(batch), error=str(e))
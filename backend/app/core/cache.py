@@ -0,0 +1,50 @@
+"""
+Redis connection management for ChainGuard AI
+"""
+
+from typing import Optional
+
+import redis.asyncio as aioredis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Shared Redis client, created once at application startup
+_redis_client: Optional[aioredis.Redis] = None
+
+
+async def init_redis() -> None:
+    """Initialize the shared Redis connection pool"""
+    global _redis_client
+    try:
+        _redis_client = aioredis.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_POOL_SIZE,
+            socket_timeout=settings.REDIS_POOL_TIMEOUT,
+            decode_responses=True,
+        )
+        await _redis_client.ping()
+        logger.info("Redis connection established successfully")
+    except Exception as e:
+        logger.error("Redis initialization failed", error=str(e))
+        raise
+
+
+async def close_redis() -> None:
+    """Close the shared Redis connection pool"""
+    global _redis_client
+    if _redis_client is not None:
+        try:
+            await _redis_client.close()
+            logger.info("Redis connections closed successfully")
+        except Exception as e:
+            logger.error("Error closing Redis connections", error=str(e))
+        finally:
+            _redis_client = None
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """Get the shared Redis client (None if not initialized)"""
+    return _redis_client
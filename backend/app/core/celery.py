@@ -2,9 +2,26 @@
 Celery configuration for ChainGuard AI
 """
 
+import asyncio
+import threading
+
 from celery import Celery
+from celery.signals import task_failure, task_success, worker_ready
+from kombu.serialization import register
+import orjson
+
 from app.core.config import settings
 
+# Analyzer payloads (Slither/Mythril findings) can run to megabytes;
+# orjson encodes and decodes them several times faster than stdlib json
+register(
+    "orjson",
+    orjson.dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="binary",
+)
+
 # Create Celery instance
 celery_app = Celery(
     "chainguard",
@@ -21,17 +38,21 @@ celery_app = Celery(
 # Celery configuration
 celery_app.conf.update(
     # Task routing
+    # Patterns are matched in order, so the trailing wildcard only catches
+    # tasks without an explicit queue — in every environment
     task_routes={
         "app.tasks.analysis_tasks.*": {"queue": "analysis"},
         "app.tasks.report_tasks.*": {"queue": "reports"},
         "app.tasks.cleanup_tasks.*": {"queue": "cleanup"},
         "app.tasks.notification_tasks.*": {"queue": "notifications"},
+        "*": {"queue": "default"},
     },
     
-    # Task serialization
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # Task serialization; json stays accepted so in-flight tasks queued
+    # by older workers still deserialize during a rollout
+    task_serializer="orjson",
+    accept_content=["orjson", "json"],
+    result_serializer="orjson",
     timezone="UTC",
     enable_utc=True,
     
@@ -50,6 +71,11 @@ celery_app.conf.update(
     task_soft_time_limit=3600,  # 1 hour
     task_time_limit=7200,       # 2 hours
     
+    # Compression: analyzer outputs stored as celery-task-meta-* keys are
+    # large and highly repetitive, so this shrinks the Redis working set
+    task_compression="gzip",
+    result_compression="gzip",
+
     # Result backend
     result_expires=3600,  # 1 hour
     result_backend_transport_options={
@@ -67,8 +93,8 @@ celery_app.conf.update(
             "task": "app.tasks.analysis_tasks.update_project_statistics",
             "schedule": 3600.0,   # Hourly
         },
-        "check-failed-runs": {
-            "task": "app.tasks.analysis_tasks.check_failed_runs",
+        "refresh-dashboard-stats": {
+            "task": "app.tasks.cleanup_tasks.refresh_dashboard_stats",
             "schedule": 300.0,    # Every 5 minutes
         },
     },
@@ -118,19 +144,46 @@ celery_app.conf.task_annotations = {
     },
 }
 
-# Task routing for different environments
-if settings.ENVIRONMENT == "development":
-    celery_app.conf.task_routes = {
-        "*": {"queue": "default"},
-    }
-elif settings.ENVIRONMENT == "production":
-    celery_app.conf.task_routes = {
-        "app.tasks.analysis_tasks.*": {"queue": "analysis"},
-        "app.tasks.report_tasks.*": {"queue": "reports"},
-        "app.tasks.cleanup_tasks.*": {"queue": "cleanup"},
-        "app.tasks.notification_tasks.*": {"queue": "notifications"},
-        "*": {"queue": "default"},
-    }
+# Failed-run handling is event-driven: instead of a 5-minute beat poll
+# that queries the database even when nothing failed, a trigger on
+# analysisrun NOTIFYs on the failed_runs channel and a listener connection
+# dispatches check_failed_runs for that run only
+def _listen_failed_runs() -> None:
+    """Hold a LISTEN connection and dispatch check_failed_runs per event"""
+    import asyncpg
+    from app.core.logging import logger
+
+    def _on_notify(connection, pid, channel, payload):
+        # run_id is passed as a keyword so check_failed_runs can keep a
+        # no-arg sweep signature (run_id=None means check everything) and
+        # stay callable from manual/legacy invocations
+        celery_app.send_task(
+            "app.tasks.analysis_tasks.check_failed_runs",
+            kwargs={"run_id": payload},
+            queue="analysis",
+        )
+
+    async def _listen() -> None:
+        conn = await asyncpg.connect(
+            settings.DATABASE_URL.replace("+asyncpg", "")
+        )
+        await conn.add_listener("failed_runs", _on_notify)
+        logger.info("Listening for failed run notifications")
+        while True:
+            await asyncio.sleep(3600)
+
+    asyncio.run(_listen())
+
+
+@worker_ready.connect
+def start_failed_run_listener(**kwargs):
+    """Start the failed_runs listener when a worker comes up"""
+    threading.Thread(
+        target=_listen_failed_runs,
+        name="failed-runs-listener",
+        daemon=True,
+    ).start()
+
 
 # Error handling
 @celery_app.task(bind=True)
@@ -138,39 +191,33 @@ def debug_task(self):
     """Debug task for testing Celery setup"""
     print(f"Request: {self.request!r}")
 
-# Task failure handling
-@celery_app.task(bind=True)
-def handle_task_failure(self, exc, task_id, args, kwargs, einfo):
+# Task failure handling; signal receivers rather than a "*" annotation so
+# the per-task rate_limit/time_limit annotations above stay in effect
+@task_failure.connect
+def handle_task_failure(sender=None, task_id=None, exception=None,
+                        args=None, kwargs=None, einfo=None, **extra):
     """Handle task failures"""
     from app.core.logging import logger
-    
+
     logger.error(
         "Task failed",
         task_id=task_id,
-        task_name=self.request.task,
+        task_name=sender.name if sender else None,
         args=args,
         kwargs=kwargs,
-        exception=str(exc),
-        traceback=einfo.traceback,
+        exception=str(exception),
+        traceback=einfo.traceback if einfo else None,
     )
 
 # Task success handling
-@celery_app.task(bind=True)
-def handle_task_success(self, retval, task_id, args, kwargs):
+@task_success.connect
+def handle_task_success(sender=None, result=None, **extra):
     """Handle task successes"""
     from app.core.logging import logger
-    
+
     logger.info(
         "Task completed successfully",
-        task_id=task_id,
-        task_name=self.request.task,
-        result=retval,
+        task_id=sender.request.id if sender else None,
+        task_name=sender.name if sender else None,
+        result=result,
     )
-
-# Register signal handlers
-celery_app.conf.task_annotations = {
-    "*": {
-        "on_failure": handle_task_failure,
-        "on_success": handle_task_success,
-    }
-}
@@ -3,8 +3,9 @@ Configuration management for ChainGuard AI
 """
 
 import os
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
-from pydantic import BaseSettings, validator, Field
+from pydantic import validator, Field
 from pydantic_settings import BaseSettings
 
 
@@ -27,6 +28,11 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field(default="HS256", env="ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7, env="REFRESH_TOKEN_EXPIRE_DAYS")
+    # Password-hash cost knobs, env-tunable so ops can retune as hardware
+    # improves without a code change
+    ARGON2_TIME_COST: int = Field(default=2, env="ARGON2_TIME_COST")
+    ARGON2_MEMORY_COST: int = Field(default=64_000, env="ARGON2_MEMORY_COST")
+    ARGON2_PARALLELISM: int = Field(default=2, env="ARGON2_PARALLELISM")
     
     # CORS
     ALLOWED_HOSTS: List[str] = Field(default=["*"], env="ALLOWED_HOSTS")
@@ -34,16 +40,24 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
-    DATABASE_POOL_SIZE: int = Field(default=20, env="DATABASE_POOL_SIZE")
+    # Sized for the dashboard read burst; tune per role via env (the API
+    # serves concurrent users, Celery workers need far fewer connections).
+    # Rule of thumb: pool_size + max_overflow >= peak concurrent asyncio
+    # tasks that hold a session, or checkouts queue behind pool_timeout.
+    DATABASE_POOL_SIZE: int = Field(default=50, env="DATABASE_POOL_SIZE")
     DATABASE_MAX_OVERFLOW: int = Field(default=30, env="DATABASE_MAX_OVERFLOW")
     DATABASE_POOL_TIMEOUT: int = Field(default=30, env="DATABASE_POOL_TIMEOUT")
     DATABASE_POOL_RECYCLE: int = Field(default=3600, env="DATABASE_POOL_RECYCLE")
+    # Pre-ping probes Postgres on every checkout; recycling makes that
+    # redundant unless an idle-killing middlebox sits between us and the DB
+    DATABASE_PRE_PING: bool = Field(default=False, env="DATABASE_PRE_PING")
     
     # Redis
     REDIS_URL: str = Field(default="redis://localhost:6379", env="REDIS_URL")
     REDIS_POOL_SIZE: int = Field(default=10, env="REDIS_POOL_SIZE")
     REDIS_POOL_TIMEOUT: int = Field(default=30, env="REDIS_POOL_TIMEOUT")
-    
+    CACHE_TTL_DASHBOARD: int = Field(default=60, env="CACHE_TTL_DASHBOARD")
+
     # Celery
     CELERY_BROKER_URL: str = Field(default="redis://localhost:6379/0", env="CELERY_BROKER_URL")
     CELERY_RESULT_BACKEND: str = Field(default="redis://localhost:6379/0", env="CELERY_RESULT_BACKEND")
@@ -212,12 +226,28 @@ class Settings(BaseSettings):
         case_sensitive = True
 
 
-# Create settings instance
-settings = Settings()
+# Settings construction parses the environment and the .env file and runs
+# every validator; caching keeps that to one pass per process no matter how
+# many import paths (API, Celery children after recycling) ask for it
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the Settings instance once per process"""
+    return Settings()
+
+
+settings = get_settings()
 
 # Validate critical settings
+_settings_validated = False
+
+
 def validate_settings():
     """Validate critical settings"""
+    global _settings_validated
+    if _settings_validated:
+        return
+    _settings_validated = True
+
     if not settings.SECRET_KEY:
         raise ValueError("SECRET_KEY must be set")
     
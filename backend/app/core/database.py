@@ -3,11 +3,13 @@ Database connection and session management for ChainGuard AI
 """
 
 import asyncio
+import hashlib
+import random
+import time
 from typing import AsyncGenerator, Optional
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-from sqlalchemy import event, text
+from sqlalchemy.pool import NullPool
+from sqlalchemy import event, insert, text
 import structlog
 
 from app.core.config import settings
@@ -22,8 +24,17 @@ engine = create_async_engine(
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_timeout=settings.DATABASE_POOL_TIMEOUT,
     pool_recycle=settings.DATABASE_POOL_RECYCLE,
-    pool_pre_ping=True,
+    pool_pre_ping=settings.DATABASE_PRE_PING,
     future=True,
+    # Let asyncpg keep server-side prepared statements for the hoisted
+    # text() queries instead of re-preparing them per connection checkout.
+    # JIT is off: these are short OLTP statements where the compile cost
+    # exceeds any execution win and shows up as tail latency.
+    connect_args={
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 1024,
+        "server_settings": {"jit": "off", "application_name": "chainguard"},
+    },
 )
 
 # Create async session factory
@@ -35,14 +46,136 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
-# Create sync session factory for migrations
-SessionLocal = sessionmaker(
-    bind=engine.sync_engine,
-    autocommit=False,
-    autoflush=False,
+# Migrations get their own short-lived sync engine on demand; binding a
+# sync sessionmaker to the async engine's facade would drag every call
+# through the greenlet bridge and pollute the asyncpg pool
+def make_sync_engine():
+    """Create a sync engine for Alembic; dispose it after use"""
+    from sqlalchemy import create_engine
+
+    return create_engine(settings.DATABASE_URL, poolclass=NullPool)
+
+# Statements issued repeatedly (liveness probes, pool warm-up, scheduled
+# cleanup) are constructed once at import like the API's hoisted queries
+_Q_PING = text("SELECT 1")
+_Q_TABLE_COUNTS = text(
+    """
+    SELECT relname, n_live_tup
+    FROM pg_stat_user_tables
+    WHERE relname IN ('user', 'project', 'analysisrun', 'finding', 'artifact')
+    """
+)
+_Q_SYSTEM_ROLES_EXIST = text(
+    "SELECT EXISTS(SELECT 1 FROM role WHERE is_system = true)"
+)
+# The three expired-data sweeps travel as one statement: one round trip,
+# one plan, and the deleted counts come back for the log line
+_Q_CLEANUP_EXPIRED = text(
+    """
+    WITH tokens AS (
+        DELETE FROM refreshtoken WHERE expires_at < NOW() RETURNING 1
+    ),
+    sessions AS (
+        DELETE FROM usersession WHERE expires_at < NOW() RETURNING 1
+    ),
+    artifacts AS (
+        DELETE FROM artifact
+        WHERE expires_at < NOW() AND expires_at IS NOT NULL RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM tokens) AS tokens,
+           (SELECT COUNT(*) FROM sessions) AS sessions,
+           (SELECT COUNT(*) FROM artifacts) AS artifacts
+    """
 )
 
 
+# Query observability: every statement is timed via cursor events, slow ones
+# are logged with a fingerprint (hash of the driver-level SQL, so literals
+# are already bound out), and a small sample of SELECTs additionally gets an
+# EXPLAIN run on a separate connection so plan regressions — e.g. a list
+# query flipping from an index scan to a seq scan — show up in the logs with
+# a stable plan hash instead of degrading silently.
+SLOW_QUERY_THRESHOLD_MS = 100
+EXPLAIN_SAMPLE_RATE = 0.01
+
+
+def _sql_fingerprint(statement: str) -> str:
+    """Stable short hash of the parameterized SQL text"""
+    return hashlib.sha256(statement.encode()).hexdigest()[:12]
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _query_timer_start(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _query_timer_end(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start_time", None)
+    if start is None or statement.lstrip()[:7].upper() == "EXPLAIN":
+        return
+
+    duration_ms = (time.perf_counter() - start) * 1000.0
+    is_slow = duration_ms >= SLOW_QUERY_THRESHOLD_MS
+    if is_slow:
+        logger.warning(
+            "Slow query",
+            sql_fingerprint=_sql_fingerprint(statement),
+            duration_ms=round(duration_ms, 1),
+            statement=statement[:200],
+        )
+
+    if (is_slow or random.random() < EXPLAIN_SAMPLE_RATE) and \
+            statement.lstrip()[:6].upper() == "SELECT" and not executemany:
+        _schedule_explain(statement, parameters)
+
+
+def _schedule_explain(statement, parameters) -> None:
+    """Fire-and-forget an EXPLAIN of the statement on the running loop"""
+    try:
+        loop = asyncio.get_event_loop()
+        loop.create_task(_explain_query(statement, parameters))
+    except RuntimeError:
+        pass
+
+
+async def _explain_query(statement, parameters) -> None:
+    """Run EXPLAIN on its own connection and log a plan summary"""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(
+                "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement,
+                parameters,
+            )
+            plan = result.scalar()[0]["Plan"]
+
+        node_types = []
+
+        def walk(node):
+            node_types.append(node.get("Node Type"))
+            for child in node.get("Plans", []):
+                walk(child)
+
+        walk(plan)
+        plan_hash = hashlib.sha256("|".join(node_types).encode()).hexdigest()[:12]
+
+        log = logger.warning if "Seq Scan" in node_types else logger.info
+        log(
+            "Query plan sampled",
+            sql_fingerprint=_sql_fingerprint(statement),
+            plan_hash=plan_hash,
+            node_types=node_types,
+            total_cost=plan.get("Total Cost"),
+            actual_rows=plan.get("Actual Rows"),
+        )
+    except Exception as e:
+        logger.debug(
+            "Query plan sampling failed",
+            sql_fingerprint=_sql_fingerprint(statement),
+            error=str(e),
+        )
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session"""
     async with AsyncSessionLocal() as session:
@@ -62,7 +195,7 @@ async def init_db() -> None:
     try:
         # Test database connection
         async with engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
+            await conn.execute(_Q_PING)
         
         logger.info("Database connection established successfully")
         
@@ -71,20 +204,47 @@ async def init_db() -> None:
         from app.models.user import User, Tenant, Role, Permission, RefreshToken, AuditLog, UserSession
         from app.models.project import Project, Contract, AnalysisRun, Finding, Artifact, CustomRule, AnalysisCheckpoint
         
-        # Create tables
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        
-        logger.info("Database tables created successfully")
+        # Create tables outside production; deployed schemas belong to
+        # migrations, and create_all re-introspects every table through
+        # pg_catalog on each pod start even when nothing changed
+        if settings.ENVIRONMENT != "production":
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+            logger.info("Database tables created successfully")
         
         # Initialize system data
         await init_system_data()
-        
+
+        # Pre-warm the pool so the first requests don't pay the
+        # TCP/TLS/auth handshake to Postgres
+        await warm_up_pool()
+
     except Exception as e:
         logger.error("Database initialization failed", error=str(e))
         raise
 
 
+# Read-only hot statements executed once per warmed connection, seeding
+# asyncpg's per-connection prepared-statement cache before real traffic
+_WARM_STATEMENTS = (_Q_PING, _Q_SYSTEM_ROLES_EXIST, _Q_TABLE_COUNTS)
+
+
+async def warm_up_pool() -> None:
+    """Open pool_size connections up-front so they exist before traffic"""
+
+    async def _warm() -> None:
+        async with engine.connect() as conn:
+            for stmt in _WARM_STATEMENTS:
+                await conn.execute(stmt)
+
+    try:
+        await asyncio.gather(*(_warm() for _ in range(settings.DATABASE_POOL_SIZE)))
+        logger.info("Connection pool pre-warmed", size=settings.DATABASE_POOL_SIZE)
+    except Exception as e:
+        logger.warning("Connection pool pre-warm failed", error=str(e))
+
+
 async def close_db() -> None:
     """Close database connections"""
     try:
@@ -94,58 +254,67 @@ async def close_db() -> None:
         logger.error("Error closing database connections", error=str(e))
 
 
+# Default permission rows, built once at import; each entry is already in
+# the executemany parameter shape the bulk insert below passes straight
+# through to asyncpg
+_DEFAULT_PERMISSIONS: tuple = tuple(
+    {"name": name, "description": description, "resource": name.split(":")[0],
+     "action": name.split(":")[1], "is_system": True}
+    for name, description in (
+        ("project:read", "Read projects"),
+        ("project:write", "Create and update projects"),
+        ("project:delete", "Delete projects"),
+        ("analysis:read", "Read analysis runs"),
+        ("analysis:write", "Create and update analysis runs"),
+        ("analysis:delete", "Delete analysis runs"),
+        ("finding:read", "Read findings"),
+        ("finding:write", "Create and update findings"),
+        ("finding:delete", "Delete findings"),
+        ("report:read", "Read reports"),
+        ("report:write", "Create and update reports"),
+        ("report:delete", "Delete reports"),
+        ("user:read", "Read users"),
+        ("user:write", "Create and update users"),
+        ("user:delete", "Delete users"),
+        ("tenant:read", "Read tenant settings"),
+        ("tenant:write", "Update tenant settings"),
+    )
+)
+
+
 async def init_system_data() -> None:
     """Initialize system data like default roles and permissions"""
     try:
         async with AsyncSessionLocal() as session:
             # Check if system data already exists
             existing_roles = await session.execute(
-                text("SELECT COUNT(*) FROM role WHERE is_system = true")
+                _Q_SYSTEM_ROLES_EXIST
             )
-            if existing_roles.scalar() > 0:
+            if existing_roles.scalar():
                 logger.info("System data already exists, skipping initialization")
                 return
-            
-            # Create default permissions
-            permissions = [
-                {"name": "project:read", "description": "Read projects", "resource": "project", "action": "read"},
-                {"name": "project:write", "description": "Create and update projects", "resource": "project", "action": "write"},
-                {"name": "project:delete", "description": "Delete projects", "resource": "project", "action": "delete"},
-                {"name": "analysis:read", "description": "Read analysis runs", "resource": "analysis", "action": "read"},
-                {"name": "analysis:write", "description": "Create and update analysis runs", "resource": "analysis", "action": "write"},
-                {"name": "analysis:delete", "description": "Delete analysis runs", "resource": "analysis", "action": "delete"},
-                {"name": "finding:read", "description": "Read findings", "resource": "finding", "action": "read"},
-                {"name": "finding:write", "description": "Create and update findings", "resource": "finding", "action": "write"},
-                {"name": "finding:delete", "description": "Delete findings", "resource": "finding", "action": "delete"},
-                {"name": "report:read", "description": "Read reports", "resource": "report", "action": "read"},
-                {"name": "report:write", "description": "Create and update reports", "resource": "report", "action": "write"},
-                {"name": "report:delete", "description": "Delete reports", "resource": "report", "action": "delete"},
-                {"name": "user:read", "description": "Read users", "resource": "user", "action": "read"},
-                {"name": "user:write", "description": "Create and update users", "resource": "user", "action": "write"},
-                {"name": "user:delete", "description": "Delete users", "resource": "user", "action": "delete"},
-                {"name": "tenant:read", "description": "Read tenant settings", "resource": "tenant", "action": "read"},
-                {"name": "tenant:write", "description": "Update tenant settings", "resource": "tenant", "action": "write"},
-            ]
-            
-            for perm_data in permissions:
-                perm = Permission(**perm_data, is_system=True)
-                session.add(perm)
-            
-            await session.commit()
-            
+
+            # executemany-style bulk inserts: one round trip per table
+            # instead of one flush per row
+            from app.models.user import Permission, Role
+
+            await session.execute(insert(Permission), list(_DEFAULT_PERMISSIONS))
+
             # Create default roles
-            from app.models.user import Role
-            
             system_roles = Role.get_system_roles()
-            for role_data in system_roles:
-                role = Role(
-                    name=role_data["name"],
-                    description=role_data["description"],
-                    permissions=role_data["permissions"],
-                    is_system=True
-                )
-                session.add(role)
-            
+            await session.execute(
+                insert(Role),
+                [
+                    {
+                        "name": role_data["name"],
+                        "description": role_data["description"],
+                        "permissions": role_data["permissions"],
+                        "is_system": True,
+                    }
+                    for role_data in system_roles
+                ]
+            )
+
             await session.commit()
             
             logger.info("System data initialized successfully")
@@ -177,8 +346,10 @@ async def execute_in_transaction(func, *args, **kwargs):
 async def check_db_health() -> bool:
     """Check database health"""
     try:
-        async with engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
+        # connect() rather than begin(): a liveness probe has no business
+        # paying BEGIN/COMMIT round trips around SELECT 1
+        async with engine.connect() as conn:
+            await conn.execute(_Q_PING)
         return True
     except Exception as e:
         logger.error("Database health check failed", error=str(e))
@@ -199,13 +370,11 @@ async def get_db_metrics() -> dict:
             )
             db_size = size_result.scalar()
             
-            # Get table counts
-            table_counts = {}
-            tables = ["user", "project", "analysisrun", "finding", "artifact"]
-            for table in tables:
-                count_result = await conn.execute(text(f"SELECT COUNT(*) FROM {table}"))
-                table_counts[table] = count_result.scalar()
-            
+            # Planner estimates from the stats catalog: one O(1) lookup
+            # instead of five sequential heap-scanning COUNT(*) round trips
+            counts_result = await conn.execute(_Q_TABLE_COUNTS)
+            table_counts = {row.relname: row.n_live_tup for row in counts_result.fetchall()}
+
             return {
                 "pool_size": pool_stats.size,
                 "checked_in": pool_stats.checkedin,
@@ -225,23 +394,16 @@ async def cleanup_expired_data() -> None:
     """Clean up expired data"""
     try:
         async with AsyncSessionLocal() as session:
-            # Clean up expired refresh tokens
-            await session.execute(
-                text("DELETE FROM refreshtoken WHERE expires_at < NOW()")
-            )
-            
-            # Clean up expired user sessions
-            await session.execute(
-                text("DELETE FROM usersession WHERE expires_at < NOW()")
-            )
-            
-            # Clean up expired artifacts
-            await session.execute(
-                text("DELETE FROM artifact WHERE expires_at < NOW() AND expires_at IS NOT NULL")
-            )
-            
+            result = await session.execute(_Q_CLEANUP_EXPIRED)
+            deleted = result.fetchone()
+
             await session.commit()
-            logger.info("Expired data cleanup completed")
+            logger.info(
+                "Expired data cleanup completed",
+                tokens=deleted.tokens,
+                sessions=deleted.sessions,
+                artifacts=deleted.artifacts,
+            )
             
     except Exception as e:
         logger.error("Failed to cleanup expired data", error=str(e))
@@ -251,41 +413,61 @@ async def cleanup_expired_data() -> None:
 async def create_backup() -> str:
     """Create database backup"""
     try:
-        import subprocess
         import os
-        from datetime import datetime
-        
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        from datetime import datetime, timezone
+        from urllib.parse import urlsplit, urlunsplit
+
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         backup_dir = "backups"
         os.makedirs(backup_dir, exist_ok=True)
-        
-        backup_file = f"{backup_dir}/chainguard_backup_{timestamp}.sql"
-        
-        # Extract database connection details
-        db_url = settings.DATABASE_URL
-        if db_url.startswith("postgresql://"):
-            db_url = db_url.replace("postgresql://", "")
-        
-        # Create backup using pg_dump
-        cmd = [
+
+        # Custom format is compressed by pg_dump itself and restorable
+        # selectively with pg_restore
+        backup_file = f"{backup_dir}/chainguard_backup_{timestamp}.dump"
+
+        # The password travels via PGPASSWORD instead of argv, where it
+        # would be visible to every local user through ps
+        parts = urlsplit(settings.DATABASE_URL.replace("+asyncpg", ""))
+        env = os.environ.copy()
+        if parts.password:
+            env["PGPASSWORD"] = parts.password
+        # The tenant tables FORCE row-level security, so the dump session
+        # must run with row security enabled and the maintenance escape
+        # hatch set, or pg_dump refuses the RLS tables / sees no rows
+        env["PGOPTIONS"] = "-c app.maintenance=on"
+        netloc = parts.hostname or ""
+        if parts.port:
+            netloc = f"{netloc}:{parts.port}"
+        if parts.username:
+            netloc = f"{parts.username}@{netloc}"
+        safe_url = urlunsplit(
+            (parts.scheme, netloc, parts.path, parts.query, parts.fragment)
+        )
+
+        # Create backup using pg_dump without blocking the event loop
+        proc = await asyncio.create_subprocess_exec(
             "pg_dump",
             "--clean",
             "--if-exists",
             "--no-owner",
             "--no-privileges",
+            "--enable-row-security",
+            "--format=custom",
             f"--file={backup_file}",
-            db_url
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
+            safe_url,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+        )
+        _, stderr = await proc.communicate()
+
+        if proc.returncode == 0:
             logger.info(f"Database backup created: {backup_file}")
             return backup_file
         else:
-            logger.error("Database backup failed", error=result.stderr)
+            logger.error("Database backup failed", error=stderr.decode())
             raise Exception("Backup failed")
-            
+
     except Exception as e:
         logger.error("Failed to create database backup", error=str(e))
         raise
@@ -324,9 +506,9 @@ async def seed_test_data() -> None:
         async with AsyncSessionLocal() as session:
             # Check if test data already exists
             existing_tenants = await session.execute(
-                text("SELECT COUNT(*) FROM tenant WHERE name LIKE '%Test%'")
+                text("SELECT EXISTS(SELECT 1 FROM tenant WHERE name LIKE '%Test%')")
             )
-            if existing_tenants.scalar() > 0:
+            if existing_tenants.scalar():
                 logger.info("Test data already exists, skipping seeding")
                 return
             
@@ -347,12 +529,7 @@ async def seed_test_data() -> None:
             
             # Create test user
             from app.core.security import get_password_hash
-            
-            admin_role = await session.execute(
-                text("SELECT id FROM role WHERE name = 'admin'")
-            )
-            admin_role_id = admin_role.scalar()
-            
+
             test_user = User(
                 email="admin@test.chainguard.ai",
                 username="testadmin",
@@ -366,10 +543,11 @@ async def seed_test_data() -> None:
             session.add(test_user)
             await session.flush()
             
-            # Assign admin role to test user
+            # Assign admin role to test user; the role id is resolved inside
+            # the INSERT instead of a separate SELECT round trip
             await session.execute(
-                text("INSERT INTO user_roles (user_id, role_id, assigned_at, assigned_by) VALUES (:user_id, :role_id, NOW(), :assigned_by)"),
-                {"user_id": test_user.id, "role_id": admin_role_id, "assigned_by": test_user.id}
+                text("INSERT INTO user_roles (user_id, role_id, assigned_at, assigned_by) SELECT :user_id, r.id, NOW(), :user_id FROM role r WHERE r.name = 'admin'"),
+                {"user_id": test_user.id}
             )
             
             await session.commit()
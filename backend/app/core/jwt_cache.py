@@ -0,0 +1,52 @@
+"""
+Short-TTL cache for decoded JWT payloads for ChainGuard AI
+"""
+
+import hashlib
+import threading
+import time
+from typing import Optional
+
+from cachetools import TTLCache
+
+# Bounded cache of decoded JWT payloads keyed by SHA-256 of the raw token.
+# The TTL is deliberately short so token revocation still propagates quickly;
+# the token's own "exp" claim is re-checked on every hit so a cached entry can
+# never outlive the token itself.
+JWT_CACHE_MAXSIZE = 10000
+JWT_CACHE_TTL_SECONDS = 5
+
+_payload_cache: TTLCache = TTLCache(maxsize=JWT_CACHE_MAXSIZE, ttl=JWT_CACHE_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+
+def _cache_key(token: str) -> bytes:
+    """Derive the cache key from the raw token"""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def get_cached_payload(token: str) -> Optional[dict]:
+    """Get the cached decoded payload for a token, if present and unexpired"""
+    with _cache_lock:
+        payload = _payload_cache.get(_cache_key(token))
+
+    if payload is None:
+        return None
+
+    # Enforce the token's own expiry even inside the cache TTL window
+    if payload.get("exp", 0) <= time.time():
+        return None
+
+    return payload
+
+
+def cache_payload(token: str, payload: dict) -> None:
+    """Cache a successfully verified JWT payload"""
+    with _cache_lock:
+        _payload_cache[_cache_key(token)] = payload
+
+
+def clear_payload_cache() -> None:
+    """Drop all cached payloads (e.g. after key rotation)"""
+    with _cache_lock:
+        _payload_cache.clear()
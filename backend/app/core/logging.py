@@ -2,25 +2,50 @@
 Logging configuration for ChainGuard AI
 """
 
+import functools
 import logging
+import os
 import sys
+import time
 from typing import Any, Dict
 
+import orjson
 import structlog
 from structlog.stdlib import LoggerFactory
 
-# Configure structlog
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """Serialize a log event with orjson; datetime/UUID need no encoder"""
+    return orjson.dumps(obj, default=str).decode()
+
+
+_stack_info_renderer = structlog.processors.StackInfoRenderer()
+
+
+def _render_exc_info(logger_, name, event_dict):
+    """Run the exception/stack renderers only when something is attached
+
+    The vast majority of events — every access-log line — carry neither,
+    so they skip both processors with a pair of dict lookups.
+    """
+    if event_dict.get("exc_info") is None and event_dict.get("stack_info") is None:
+        return event_dict
+    event_dict = _stack_info_renderer(logger_, name, event_dict)
+    return structlog.processors.format_exc_info(logger_, name, event_dict)
+
+
+# Configure structlog; the renderer runs on every log line, so it uses
+# orjson rather than the stdlib json serializer
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
+        structlog.processors.TimeStamper(fmt="iso", utc=True, key="ts"),
+        _render_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps)
     ],
     context_class=dict,
     logger_factory=LoggerFactory(),
@@ -59,71 +84,80 @@ def setup_logging(
 # Logging middleware for FastAPI
 class LoggingMiddleware:
     """Middleware to log HTTP requests and responses"""
-    
+
     def __init__(self, app):
         self.app = app
-        self.logger = structlog.get_logger("http")
-    
+
     async def __call__(self, scope, receive, send):
-        if scope["type"] == "http":
-            # Log request
-            self.logger.info(
-                "HTTP request",
-                method=scope["method"],
-                path=scope["path"],
-                client_ip=scope.get("client", ("unknown",))[0],
-                user_agent=dict(scope.get("headers", [])).get(b"user-agent", b"").decode(),
-            )
-            
-            # Track response
-            response_status = None
-            
-            async def send_wrapper(message):
-                nonlocal response_status
-                if message["type"] == "http.response.start":
-                    response_status = message["status"]
-                await send(message)
-            
-            await self.app(scope, receive, send_wrapper)
-            
-            # Log response
-            self.logger.info(
-                "HTTP response",
-                method=scope["method"],
-                path=scope["path"],
-                status=response_status,
-            )
-        else:
+        # When INFO is filtered out, skip the whole formatting pipeline
+        if scope["type"] != "http" or \
+                not logging.getLogger("http").isEnabledFor(logging.INFO):
             await self.app(scope, receive, send)
+            return
+
+        # Single pass over the raw header list; materializing a dict per
+        # request just to read one header is pure allocation
+        user_agent = b""
+        for key, value in scope.get("headers", ()):
+            if key == b"user-agent":
+                user_agent = value
+                break
+
+        start = time.perf_counter()
+        response_status = None
+
+        async def send_wrapper(message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        # The access log has a fixed schema, so the line is serialized
+        # directly with orjson and written in one syscall rather than
+        # passing through the structlog processor chain
+        line = orjson.dumps({
+            "ts": time.time(),
+            "level": "info",
+            "logger": "http",
+            "event": "HTTP request",
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": response_status,
+            "duration_ms": round((time.perf_counter() - start) * 1000.0, 1),
+            "client_ip": scope.get("client", ("unknown",))[0],
+            "user_agent": user_agent.decode(),
+        })
+        os.write(sys.stdout.fileno(), line + b"\n")
 
 # Structured logging for different components
 def get_logger(name: str) -> structlog.BoundLogger:
     """Get a structured logger for a specific component"""
     return structlog.get_logger(name)
 
-# Logging decorators
+# Logging decorators; arguments and results are summarized by type rather
+# than serialized — a decorated function returning an ORM row or a bytes
+# payload would otherwise push its whole object graph through the renderer
+# on every call. Full payloads only appear at DEBUG.
 def log_function_call(func):
     """Decorator to log function calls"""
+    # Bound once at decoration time: the wrapper pays no logger lookup or
+    # function-name rebinding per call
+    bound = get_logger(func.__module__).bind(function=func.__name__)
+    std_logger = logging.getLogger(func.__module__)
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        logger = get_logger(func.__module__)
-        logger.info(
-            "Function called",
-            function=func.__name__,
-            args=args,
-            kwargs=kwargs,
-        )
+        if std_logger.isEnabledFor(logging.DEBUG):
+            bound.debug("Function called", args=args, kwargs=kwargs)
         try:
             result = func(*args, **kwargs)
-            logger.info(
-                "Function completed",
-                function=func.__name__,
-                result=result,
-            )
+            bound.info("Function completed", result_type=type(result).__name__)
             return result
         except Exception as e:
-            logger.error(
+            bound.error(
                 "Function failed",
-                function=func.__name__,
                 error=str(e),
                 exception_type=type(e).__name__,
             )
@@ -132,26 +166,23 @@ def log_function_call(func):
 
 def log_async_function_call(func):
     """Decorator to log async function calls"""
+    bound = get_logger(func.__module__).bind(function=func.__name__)
+    std_logger = logging.getLogger(func.__module__)
+
+    @functools.wraps(func)
     async def wrapper(*args, **kwargs):
-        logger = get_logger(func.__module__)
-        logger.info(
-            "Async function called",
-            function=func.__name__,
-            args=args,
-            kwargs=kwargs,
-        )
+        if std_logger.isEnabledFor(logging.DEBUG):
+            bound.debug("Async function called", args=args, kwargs=kwargs)
         try:
             result = await func(*args, **kwargs)
-            logger.info(
+            bound.info(
                 "Async function completed",
-                function=func.__name__,
-                result=result,
+                result_type=type(result).__name__,
             )
             return result
         except Exception as e:
-            logger.error(
+            bound.error(
                 "Async function failed",
-                function=func.__name__,
                 error=str(e),
                 exception_type=type(e).__name__,
             )
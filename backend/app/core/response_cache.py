@@ -0,0 +1,70 @@
+"""
+Redis-backed response cache for hot read endpoints
+"""
+
+from typing import Any, Dict, Optional
+
+import orjson
+import structlog
+
+from app.core.cache import get_redis
+
+logger = structlog.get_logger(__name__)
+
+RESPONSE_CACHE_TTL_SECONDS = 60
+
+
+def build_cache_key(tenant_id: str, path: str, params: Dict[str, Any]) -> str:
+    """Build a tenant-scoped cache key from the request path and params"""
+    qs = "&".join(f"{k}={v}" for k, v in sorted(params.items()) if v is not None)
+    return f"resp:{tenant_id}:{path}:{qs}"
+
+
+async def get_cached_response(key: str) -> Optional[str]:
+    """
+    Return the cached serialized response body, or None on miss or outage.
+
+    The body is stored as the final JSON text, so hits go straight into a
+    Response without a decode/validate/re-encode round trip.
+    """
+    redis_client = get_redis()
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except Exception as e:
+        logger.warning("Response cache read failed", key=key, error=str(e))
+    return None
+
+
+async def set_cached_response(
+    key: str, payload: Any, ttl: int = RESPONSE_CACHE_TTL_SECONDS
+) -> None:
+    """Store a response payload with a TTL; failures only log
+
+    Callers that already hold the serialized body pass bytes straight
+    through; anything else is encoded here.
+    """
+    redis_client = get_redis()
+    if redis_client is None:
+        return
+    try:
+        if not isinstance(payload, (bytes, str)):
+            payload = orjson.dumps(payload)
+        await redis_client.setex(key, ttl, payload)
+    except Exception as e:
+        logger.warning("Response cache write failed", key=key, error=str(e))
+
+
+async def invalidate_tenant_responses(tenant_id: str) -> None:
+    """Drop every cached response for a tenant after a write"""
+    redis_client = get_redis()
+    if redis_client is None:
+        return
+    try:
+        async for key in redis_client.scan_iter(match=f"resp:{tenant_id}:*", count=100):
+            await redis_client.unlink(key)
+    except Exception as e:
+        logger.warning(
+            "Response cache invalidation failed", tenant_id=tenant_id, error=str(e)
+        )
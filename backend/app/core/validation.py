@@ -0,0 +1,79 @@
+"""
+Pure validation helpers shared by schemas and security utilities
+
+Kept free of passlib/jwt imports so the schema modules (and anything else
+that only needs format checks) don't drag the crypto stack into their
+import graph at worker start.
+"""
+
+import re
+import string
+from typing import Optional
+
+_UPPER = frozenset(string.ascii_uppercase)
+_LOWER = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+_SPECIAL = frozenset("!@#$%^&*")
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
+def _scan_char_classes(password: str) -> tuple:
+    """Return (has_upper, has_lower, has_digit, has_special)
+
+    Building the character set and intersecting runs entirely in C, so
+    this beats a Python-level per-character loop even though it touches
+    the string twice in the worst case.
+    """
+    chars = set(password)
+    return (
+        not _UPPER.isdisjoint(chars),
+        not _LOWER.isdisjoint(chars),
+        not _DIGITS.isdisjoint(chars),
+        not _SPECIAL.isdisjoint(chars),
+    )
+
+
+def validate_email(email: str) -> bool:
+    """Validate email format"""
+    return _EMAIL_RE.match(email) is not None
+
+
+def password_strength_errors(password: str) -> Optional[list]:
+    """Return a list of policy violations, or None when the password passes
+
+    Success - the overwhelmingly common case for request validators -
+    allocates nothing beyond the single class-scan pass.
+    """
+    has_upper, has_lower, has_digit, has_special = _scan_char_classes(password)
+
+    if len(password) >= 8 and has_upper and has_lower and has_digit and has_special:
+        return None
+
+    errors = []
+
+    if len(password) < 8:
+        errors.append("Password must be at least 8 characters long")
+
+    if not has_upper:
+        errors.append("Password must contain at least one uppercase letter")
+
+    if not has_lower:
+        errors.append("Password must contain at least one lowercase letter")
+
+    if not has_digit:
+        errors.append("Password must contain at least one digit")
+
+    if not has_special:
+        errors.append("Password must contain at least one special character (!@#$%^&*)")
+
+    return errors
+
+
+def validate_password_strength(password: str) -> dict:
+    """Validate password strength"""
+    errors = password_strength_errors(password)
+    return {
+        "valid": errors is None,
+        "errors": errors or []
+    }
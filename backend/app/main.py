@@ -10,7 +10,7 @@ from typing import Dict, Any
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from prometheus_fastapi_instrumentator import Instrumentator
@@ -61,6 +61,11 @@ async def lifespan(app: FastAPI):
     from app.core.cache import init_redis
     await init_redis()
     logger.info("Redis initialized")
+
+    # Start the background audit-event queue
+    from app.core.audit_queue import start_audit_queue
+    start_audit_queue()
+    logger.info("Audit queue initialized")
     
     # Initialize AI/ML services
     from app.core.ai import init_ai_services
@@ -76,6 +81,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down ChainGuard AI application")
+    from app.core.audit_queue import stop_audit_queue
+    await stop_audit_queue()
     await close_db()
     logger.info("Application shutdown complete")
 
@@ -90,6 +97,7 @@ def create_application() -> FastAPI:
         docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
         redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
         openapi_url="/openapi.json" if settings.ENVIRONMENT != "production" else None,
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
     
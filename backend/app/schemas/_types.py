@@ -0,0 +1,23 @@
+"""
+Shared constrained-field aliases for ChainGuard AI schemas
+"""
+
+from typing import Annotated, Optional
+
+from pydantic import Field
+
+# One alias per constraint shape, reused across the schema modules:
+# pydantic-core builds a single validator per unique annotation instead
+# of one per field declaration, which trims schema-build time at import
+# and the resident size of the generated OpenAPI document.
+Name50 = Annotated[str, Field(min_length=1, max_length=50)]
+Name100 = Annotated[str, Field(min_length=1, max_length=100)]
+Name200 = Annotated[str, Field(min_length=1, max_length=200)]
+
+OptName50 = Annotated[Optional[str], Field(None, min_length=1, max_length=50)]
+OptName100 = Annotated[Optional[str], Field(None, min_length=1, max_length=100)]
+OptName200 = Annotated[Optional[str], Field(None, min_length=1, max_length=200)]
+
+OptDesc200 = Annotated[Optional[str], Field(None, max_length=200)]
+OptDesc500 = Annotated[Optional[str], Field(None, max_length=500)]
+OptDesc1000 = Annotated[Optional[str], Field(None, max_length=1000)]
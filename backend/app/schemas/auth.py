@@ -3,11 +3,44 @@ Authentication schemas for ChainGuard AI
 """
 
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, validator
+from typing import Annotated, Literal, Optional, List
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, Field
 from enum import Enum
 
-from app.core.security import validate_email, validate_password_strength
+from app.core.validation import validate_email, password_strength_errors
+from app.schemas._types import (
+    Name50, Name100, OptName50, OptName100, OptDesc200, OptDesc500
+)
+
+
+def _check_password_strength(v: str) -> str:
+    errors = password_strength_errors(v)
+    if errors:
+        raise ValueError(f"Password validation failed: {', '.join(errors)}")
+    return v
+
+
+def _check_email_format(v: str) -> str:
+    if not validate_email(v):
+        raise ValueError("Invalid email format")
+    return v
+
+
+# Shared annotated types: pydantic-core dispatches these validators
+# directly, without the per-model classmethod machinery the old
+# @validator duplicates paid on every construction
+StrongPassword = Annotated[
+    str,
+    Field(min_length=8, max_length=128),
+    AfterValidator(_check_password_strength),
+]
+CheckedEmail = Annotated[EmailStr, AfterValidator(_check_email_format)]
+
+# Regex-only email check for request-path schemas (login, reset, resend):
+# these addresses are matched against stored accounts, not persisted, so
+# the full email-validator parse EmailStr runs is wasted work there.
+# Creation flows (UserCreate, TenantCreate) keep EmailStr for correctness.
+FastEmail = Annotated[str, AfterValidator(_check_email_format)]
 
 
 class UserStatus(str, Enum):
@@ -32,44 +65,87 @@ class RoleType(str, Enum):
     GUEST = "guest"
 
 
+# Permission schemas
+class PermissionBase(BaseModel):
+    name: Name100
+    description: OptDesc200
+    resource: Name50
+    action: Name50
+    is_system: bool = False
+
+
+class PermissionCreate(PermissionBase):
+    pass
+
+
+class PermissionUpdate(BaseModel):
+    name: OptName100
+    description: OptDesc200
+    resource: OptName50
+    action: OptName50
+
+
+class PermissionResponse(PermissionBase):
+    id: str
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+
+# Role schemas
+class RoleBase(BaseModel):
+    name: Name50
+    description: OptDesc200
+    is_system: bool = False
+
+
+class RoleCreate(RoleBase):
+    permission_ids: List[str] = Field(default_factory=list)
+
+
+class RoleUpdate(BaseModel):
+    name: OptName50
+    description: OptDesc200
+    permission_ids: Optional[List[str]] = None
+
+
+class RoleResponse(RoleBase):
+    id: str
+    permissions: List[PermissionResponse] = Field(default_factory=list)
+    user_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+
 # User schemas
 class UserBase(BaseModel):
     email: EmailStr
     username: str = Field(..., min_length=3, max_length=50)
-    first_name: str = Field(..., min_length=1, max_length=50)
-    last_name: str = Field(..., min_length=1, max_length=50)
+    first_name: Name50
+    last_name: Name50
     is_active: bool = True
     is_verified: bool = False
 
 
 class UserCreate(UserBase):
-    password: str = Field(..., min_length=8, max_length=128)
+    email: CheckedEmail
+    password: StrongPassword
     tenant_id: Optional[str] = None
-    role_ids: Optional[List[str]] = []
-    
-    @validator('password')
-    def validate_password(cls, v):
-        validation = validate_password_strength(v)
-        if not validation['valid']:
-            raise ValueError(f"Password validation failed: {', '.join(validation['errors'])}")
-        return v
-    
-    @validator('email')
-    def validate_email_format(cls, v):
-        if not validate_email(v):
-            raise ValueError("Invalid email format")
-        return v
+    role_ids: Optional[List[str]] = Field(default_factory=list)
 
 
 class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     username: Optional[str] = Field(None, min_length=3, max_length=50)
-    first_name: Optional[str] = Field(None, min_length=1, max_length=50)
-    last_name: Optional[str] = Field(None, min_length=1, max_length=50)
+    first_name: OptName50
+    last_name: OptName50
     is_active: Optional[bool] = None
     is_verified: Optional[bool] = None
     profile_picture_url: Optional[str] = None
-    bio: Optional[str] = Field(None, max_length=500)
+    bio: OptDesc500
     timezone: Optional[str] = None
     language: Optional[str] = None
 
@@ -84,11 +160,10 @@ class UserResponse(UserBase):
     last_login_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
-    roles: List['RoleResponse'] = []
-    permissions: List[str] = []
+    roles: List[RoleResponse] = Field(default_factory=list)
+    permissions: List[str] = Field(default_factory=list)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class UserListResponse(BaseModel):
@@ -101,9 +176,9 @@ class UserListResponse(BaseModel):
 
 # Tenant schemas
 class TenantBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=100)
-    domain: str = Field(..., min_length=1, max_length=100)
-    description: Optional[str] = Field(None, max_length=500)
+    name: Name100
+    domain: Name100
+    description: OptDesc500
     subscription_plan: SubscriptionPlan = SubscriptionPlan.FREE
     max_users: int = Field(default=5, ge=1, le=1000)
     max_projects: int = Field(default=10, ge=1, le=10000)
@@ -112,22 +187,15 @@ class TenantBase(BaseModel):
 
 class TenantCreate(TenantBase):
     admin_email: EmailStr
-    admin_first_name: str = Field(..., min_length=1, max_length=50)
-    admin_last_name: str = Field(..., min_length=1, max_length=50)
-    admin_password: str = Field(..., min_length=8, max_length=128)
-    
-    @validator('admin_password')
-    def validate_password(cls, v):
-        validation = validate_password_strength(v)
-        if not validation['valid']:
-            raise ValueError(f"Password validation failed: {', '.join(validation['errors'])}")
-        return v
+    admin_first_name: Name50
+    admin_last_name: Name50
+    admin_password: StrongPassword
 
 
 class TenantUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=100)
-    domain: Optional[str] = Field(None, min_length=1, max_length=100)
-    description: Optional[str] = Field(None, max_length=500)
+    name: OptName100
+    domain: OptName100
+    description: OptDesc500
     subscription_plan: Optional[SubscriptionPlan] = None
     max_users: Optional[int] = Field(None, ge=1, le=1000)
     max_projects: Optional[int] = Field(None, ge=1, le=10000)
@@ -137,77 +205,19 @@ class TenantUpdate(BaseModel):
 
 class TenantResponse(TenantBase):
     id: str
-    settings: dict = {}
+    settings: dict = Field(default_factory=dict)
     created_at: datetime
     updated_at: datetime
     user_count: int = 0
     project_count: int = 0
     storage_used_gb: float = 0.0
     
-    class Config:
-        from_attributes = True
-
-
-# Role schemas
-class RoleBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=50)
-    description: Optional[str] = Field(None, max_length=200)
-    is_system: bool = False
-
-
-class RoleCreate(RoleBase):
-    permission_ids: List[str] = []
-
-
-class RoleUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=50)
-    description: Optional[str] = Field(None, max_length=200)
-    permission_ids: Optional[List[str]] = None
-
-
-class RoleResponse(RoleBase):
-    id: str
-    permissions: List['PermissionResponse'] = []
-    user_count: int = 0
-    created_at: datetime
-    updated_at: datetime
-    
-    class Config:
-        from_attributes = True
-
-
-# Permission schemas
-class PermissionBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=100)
-    description: Optional[str] = Field(None, max_length=200)
-    resource: str = Field(..., min_length=1, max_length=50)
-    action: str = Field(..., min_length=1, max_length=50)
-    is_system: bool = False
-
-
-class PermissionCreate(PermissionBase):
-    pass
-
-
-class PermissionUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=100)
-    description: Optional[str] = Field(None, max_length=200)
-    resource: Optional[str] = Field(None, min_length=1, max_length=50)
-    action: Optional[str] = Field(None, min_length=1, max_length=50)
-
-
-class PermissionResponse(PermissionBase):
-    id: str
-    created_at: datetime
-    updated_at: datetime
-    
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 # Authentication schemas
 class LoginRequest(BaseModel):
-    email: EmailStr
+    email: FastEmail
     password: str
     remember_me: bool = False
     totp_token: Optional[str] = None
@@ -216,7 +226,7 @@ class LoginRequest(BaseModel):
 class LoginResponse(BaseModel):
     access_token: str
     refresh_token: str
-    token_type: str = "bearer"
+    token_type: Literal["bearer"] = "bearer"
     expires_in: int
     user: UserResponse
 
@@ -227,7 +237,7 @@ class RefreshTokenRequest(BaseModel):
 
 class RefreshTokenResponse(BaseModel):
     access_token: str
-    token_type: str = "bearer"
+    token_type: Literal["bearer"] = "bearer"
     expires_in: int
 
 
@@ -237,30 +247,16 @@ class LogoutRequest(BaseModel):
 
 class ChangePasswordRequest(BaseModel):
     current_password: str
-    new_password: str = Field(..., min_length=8, max_length=128)
-    
-    @validator('new_password')
-    def validate_password(cls, v):
-        validation = validate_password_strength(v)
-        if not validation['valid']:
-            raise ValueError(f"Password validation failed: {', '.join(validation['errors'])}")
-        return v
+    new_password: StrongPassword
 
 
 class ResetPasswordRequest(BaseModel):
-    email: EmailStr
+    email: FastEmail
 
 
 class ResetPasswordConfirm(BaseModel):
     token: str
-    new_password: str = Field(..., min_length=8, max_length=128)
-    
-    @validator('new_password')
-    def validate_password(cls, v):
-        validation = validate_password_strength(v)
-        if not validation['valid']:
-            raise ValueError(f"Password validation failed: {', '.join(validation['errors'])}")
-        return v
+    new_password: StrongPassword
 
 
 class VerifyEmailRequest(BaseModel):
@@ -268,7 +264,7 @@ class VerifyEmailRequest(BaseModel):
 
 
 class ResendVerificationRequest(BaseModel):
-    email: EmailStr
+    email: FastEmail
 
 
 # Two-factor authentication schemas
@@ -322,8 +318,7 @@ class AuditLogResponse(AuditLogBase):
     created_at: datetime
     user: Optional[UserResponse] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class AuditLogListResponse(BaseModel):
@@ -336,9 +331,9 @@ class AuditLogListResponse(BaseModel):
 
 # API key schemas
 class APIKeyBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=100)
-    description: Optional[str] = Field(None, max_length=200)
-    permissions: List[str] = []
+    name: Name100
+    description: OptDesc200
+    permissions: List[str] = Field(default_factory=list)
     expires_at: Optional[datetime] = None
 
 
@@ -353,16 +348,10 @@ class APIKeyResponse(APIKeyBase):
     last_used_at: Optional[datetime] = None
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class APIKeyListResponse(BaseModel):
     api_keys: List[APIKeyResponse]
     total: int
 
-
-# Update forward references
-UserResponse.model_rebuild()
-RoleResponse.model_rebuild()
-PermissionResponse.model_rebuild()
@@ -3,10 +3,19 @@ Project and analysis schemas for ChainGuard AI
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, validator, HttpUrl
+from typing import Annotated, Literal, Optional, List, Dict, Any, Union
+from pydantic import (
+    AfterValidator, BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter,
+    validator,
+)
 from enum import Enum
 import re
+import sys
+import time
+
+from app.schemas._types import (
+    Name200, OptName200, OptDesc500, OptDesc1000
+)
 
 
 class ProjectType(str, Enum):
@@ -94,13 +103,37 @@ class ArtifactType(str, Enum):
     METADATA = "metadata"
 
 
+# Inbound payloads coerce these strings to enum members on every request;
+# interning the values lets the member-map lookups resolve by pointer
+# equality instead of a full hash-and-compare on a fresh string object
+for _enum in (ProjectType, ProjectFramework, ProjectStatus, AnalysisProfile,
+              RunStatus, FindingSeverity, FindingStatus, FindingCategory,
+              ArtifactType):
+    for _member in _enum:
+        sys.intern(_member.value)
+
+# Direct value->member maps for batch ingestion paths (tool-output
+# parsers) that coerce severities/categories before building models
+SEVERITY_LOOKUP = FindingSeverity._value2member_map_
+CATEGORY_LOOKUP = FindingCategory._value2member_map_
+
+
+# Compiled once; the validator runs on every ProjectCreate/ProjectUpdate
+_ETH_ADDRESS_RE = re.compile(r'^0x[a-fA-F0-9]{40}$')
+
+# The clone step only needs an http(s) URL it can hand to git/requests;
+# a scheme prefix check plus length cap covers that without HttpUrl's
+# full parse (idna, host split, port extraction) on every project write
+SourceUrl = Annotated[str, StringConstraints(pattern=r'^https?://', max_length=2000)]
+
+
 # Project schemas
 class ProjectBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=200)
-    description: Optional[str] = Field(None, max_length=1000)
+    name: Name200
+    description: OptDesc1000
     project_type: ProjectType
     framework: Optional[ProjectFramework] = None
-    source_url: Optional[HttpUrl] = None
+    source_url: Optional[SourceUrl] = None
     contract_address: Optional[str] = None
     settings: Dict[str, Any] = Field(default_factory=dict)
     
@@ -108,7 +141,7 @@ class ProjectBase(BaseModel):
     def validate_contract_address(cls, v):
         if v is not None:
             # Basic Ethereum address validation
-            if not re.match(r'^0x[a-fA-F0-9]{40}$', v):
+            if not _ETH_ADDRESS_RE.match(v):
                 raise ValueError("Invalid Ethereum address format")
         return v
 
@@ -118,8 +151,8 @@ class ProjectCreate(ProjectBase):
 
 
 class ProjectUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=200)
-    description: Optional[str] = Field(None, max_length=1000)
+    name: OptName200
+    description: OptDesc1000
     status: Optional[ProjectStatus] = None
     settings: Optional[Dict[str, Any]] = None
 
@@ -137,21 +170,18 @@ class ProjectResponse(ProjectBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class ProjectListResponse(BaseModel):
     projects: List[ProjectResponse]
-    total: int
-    page: int
     size: int
-    pages: int
+    next_cursor: Optional[str] = None
 
 
 # Contract schemas
 class ContractBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=200)
+    name: Name200
     path: Optional[str] = None
     version: Optional[str] = None
     license: Optional[str] = None
@@ -167,7 +197,7 @@ class ContractCreate(ContractBase):
 
 
 class ContractUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    name: OptName200
     path: Optional[str] = None
     version: Optional[str] = None
     license: Optional[str] = None
@@ -184,15 +214,14 @@ class ContractResponse(ContractBase):
     updated_at: datetime
     finding_count: int = 0
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 # Analysis run schemas
 class AnalysisRunBase(BaseModel):
     profile: AnalysisProfile
     settings: Dict[str, Any] = Field(default_factory=dict)
-    description: Optional[str] = Field(None, max_length=500)
+    description: OptDesc500
     tags: List[str] = Field(default_factory=list)
 
 
@@ -202,7 +231,7 @@ class AnalysisRunCreate(AnalysisRunBase):
 
 class AnalysisRunUpdate(BaseModel):
     status: Optional[RunStatus] = None
-    description: Optional[str] = Field(None, max_length=500)
+    description: OptDesc500
     tags: Optional[List[str]] = None
     settings: Optional[Dict[str, Any]] = None
 
@@ -221,19 +250,19 @@ class AnalysisRunResponse(AnalysisRunBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class AnalysisRunListResponse(BaseModel):
     runs: List[AnalysisRunResponse]
-    total: int
-    page: int
     size: int
-    pages: int
+    next_cursor: Optional[str] = None
 
 
 # Finding schemas
+# Leaf value objects instantiated in bulk (several per finding). frozen
+# models skip the mutation bookkeeping pydantic keeps for settable fields
+# and are hashable, so downstream dedup can put them straight into sets.
 class CodeSpan(BaseModel):
     file_path: str
     start_line: int
@@ -242,6 +271,8 @@ class CodeSpan(BaseModel):
     end_column: Optional[int] = None
     code_snippet: Optional[str] = None
 
+    model_config = ConfigDict(frozen=True)
+
 
 class Evidence(BaseModel):
     type: str
@@ -250,6 +281,8 @@ class Evidence(BaseModel):
     file_path: Optional[str] = None
     line_number: Optional[int] = None
 
+    model_config = ConfigDict(frozen=True)
+
 
 class Recommendation(BaseModel):
     title: str
@@ -258,6 +291,8 @@ class Recommendation(BaseModel):
     effort: str
     priority: str
 
+    model_config = ConfigDict(frozen=True)
+
 
 class Patch(BaseModel):
     diff: str
@@ -265,9 +300,11 @@ class Patch(BaseModel):
     test_code: Optional[str] = None
     risk_level: str = "low"
 
+    model_config = ConfigDict(frozen=True)
+
 
 class FindingBase(BaseModel):
-    title: str = Field(..., min_length=1, max_length=200)
+    title: Name200
     description: str = Field(..., min_length=1, max_length=5000)
     severity: FindingSeverity
     category: FindingCategory
@@ -287,8 +324,16 @@ class FindingCreate(FindingBase):
     contract_id: Optional[str] = None
 
 
+# Batch adapters for tool-output ingestion: analyzer sinks hand the whole
+# parsed list to pydantic-core in one call instead of constructing models
+# item by item in a Python loop (pairs with SEVERITY_LOOKUP/CATEGORY_LOOKUP
+# above for pre-coercing enum values)
+FINDING_BATCH_ADAPTER = TypeAdapter(List[FindingCreate])
+CONTRACT_BATCH_ADAPTER = TypeAdapter(List[ContractCreate])
+
+
 class FindingUpdate(BaseModel):
-    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    title: OptName200
     description: Optional[str] = Field(None, min_length=1, max_length=5000)
     severity: Optional[FindingSeverity] = None
     status: Optional[FindingStatus] = None
@@ -304,6 +349,7 @@ class FindingResponse(FindingBase):
     id: str
     run_id: str
     contract_id: Optional[str]
+    contract_name: Optional[str] = None
     status: FindingStatus
     notes: Optional[str] = None
     assigned_to: Optional[str] = None
@@ -311,16 +357,13 @@ class FindingResponse(FindingBase):
     updated_at: datetime
     contract: Optional[ContractResponse] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class FindingListResponse(BaseModel):
     findings: List[FindingResponse]
-    total: int
-    page: int
     size: int
-    pages: int
+    next_cursor: Optional[str] = None
     severity_counts: Dict[str, int] = Field(default_factory=dict)
     category_counts: Dict[str, int] = Field(default_factory=dict)
 
@@ -328,8 +371,8 @@ class FindingListResponse(BaseModel):
 # Artifact schemas
 class ArtifactBase(BaseModel):
     kind: ArtifactType
-    name: str = Field(..., min_length=1, max_length=200)
-    description: Optional[str] = Field(None, max_length=500)
+    name: Name200
+    description: OptDesc500
     file_path: Optional[str] = None
     file_size: Optional[int] = None
     checksum: Optional[str] = None
@@ -341,8 +384,8 @@ class ArtifactCreate(ArtifactBase):
 
 
 class ArtifactUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=200)
-    description: Optional[str] = Field(None, max_length=500)
+    name: OptName200
+    description: OptDesc500
     metadata: Optional[Dict[str, Any]] = None
 
 
@@ -354,8 +397,7 @@ class ArtifactResponse(ArtifactBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class ArtifactListResponse(BaseModel):
@@ -364,10 +406,31 @@ class ArtifactListResponse(BaseModel):
 
 
 # Custom rule schemas
+def _check_rule_pattern(v: str) -> str:
+    """Compile the rule regex up front so a bad pattern fails at submit
+    time with a 422 instead of mid-run on the analyzer path.
+
+    re.compile also primes the module-level pattern cache, so the first
+    downstream re.search against this pattern skips recompilation.
+    """
+    try:
+        re.compile(v)
+    except re.error as e:
+        raise ValueError(f"Invalid regex pattern: {e}")
+    return v
+
+
+RulePattern = Annotated[
+    str,
+    Field(min_length=1, max_length=1000),
+    AfterValidator(_check_rule_pattern),
+]
+
+
 class CustomRuleBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=200)
+    name: Name200
     description: str = Field(..., min_length=1, max_length=1000)
-    pattern: str = Field(..., min_length=1, max_length=1000)
+    pattern: RulePattern
     severity: FindingSeverity
     category: FindingCategory
     enabled: bool = True
@@ -379,9 +442,9 @@ class CustomRuleCreate(CustomRuleBase):
 
 
 class CustomRuleUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    name: OptName200
     description: Optional[str] = Field(None, min_length=1, max_length=1000)
-    pattern: Optional[str] = Field(None, min_length=1, max_length=1000)
+    pattern: Optional[RulePattern] = None
     severity: Optional[FindingSeverity] = None
     category: Optional[FindingCategory] = None
     enabled: Optional[bool] = None
@@ -394,8 +457,7 @@ class CustomRuleResponse(CustomRuleBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class CustomRuleListResponse(BaseModel):
@@ -422,8 +484,7 @@ class AnalysisCheckpointResponse(AnalysisCheckpointBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 # Gas report schemas
@@ -436,6 +497,8 @@ class GasReport(BaseModel):
     execution_cost: Optional[float] = None
     optimization_suggestions: List[str] = Field(default_factory=list)
 
+    model_config = ConfigDict(frozen=True)
+
 
 class CoverageReport(BaseModel):
     file_path: str
@@ -445,6 +508,8 @@ class CoverageReport(BaseModel):
     uncovered_lines: List[int] = Field(default_factory=list)
     uncovered_branches: List[Dict[str, Any]] = Field(default_factory=list)
 
+    model_config = ConfigDict(frozen=True)
+
 
 # Search schemas
 class SearchQuery(BaseModel):
@@ -499,26 +564,43 @@ class ProjectStats(BaseModel):
 
 
 # WebSocket schemas
+#
+# Progress broadcasts construct many messages back to back; the stamp is
+# cached for 1ms behind a monotonic guard so a burst shares one datetime
+# allocation instead of paying a clock read per message
+_TS_CACHE = [0.0, datetime.utcnow()]
+
+
+def _fast_utcnow() -> datetime:
+    """datetime.utcnow memoized for one millisecond"""
+    m = time.monotonic()
+    if m - _TS_CACHE[0] > 0.001:
+        _TS_CACHE[0] = m
+        _TS_CACHE[1] = datetime.utcnow()
+    return _TS_CACHE[1]
+
+
 class WebSocketMessage(BaseModel):
     type: str
     data: Dict[str, Any]
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_fast_utcnow)
 
 
 class RunProgressMessage(WebSocketMessage):
-    type: str = "run_progress"
+    type: Literal["run_progress"] = "run_progress"
     data: Dict[str, Any]  # Contains run_id, progress, status, etc.
 
 
 class FindingUpdateMessage(WebSocketMessage):
-    type: str = "finding_update"
+    type: Literal["finding_update"] = "finding_update"
     data: Dict[str, Any]  # Contains finding_id, updates, etc.
 
 
-# Update forward references
-ProjectResponse.model_rebuild()
-ContractResponse.model_rebuild()
-AnalysisRunResponse.model_rebuild()
-FindingResponse.model_rebuild()
-ArtifactResponse.model_rebuild()
-CustomRuleResponse.model_rebuild()
+# Tagged union for inbound WS traffic: the Literal discriminator lets
+# pydantic-core dispatch straight to the right message validator instead
+# of trying each member in turn
+WSMessage = Annotated[
+    Union[RunProgressMessage, FindingUpdateMessage],
+    Field(discriminator="type"),
+]
+
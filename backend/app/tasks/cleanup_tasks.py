@@ -0,0 +1,62 @@
+"""
+Scheduled maintenance tasks for ChainGuard AI
+"""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+import structlog
+
+from app.core.celery import celery_app
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Flags the session as maintenance so the RLS policies let the statement see
+# every tenant's rows (set_config with is_local=false spans the connection)
+_Q_MAINTENANCE_MODE = text("SELECT set_config('app.maintenance', 'on', false)")
+
+_Q_REFRESH_DASHBOARD_STATS = text(
+    "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_dashboard_stats"
+)
+
+_Q_CLEANUP_OLD_DATA = text("SELECT cleanup_old_data()")
+
+
+async def _run_maintenance_statement(statement) -> None:
+    """Execute a maintenance statement on a dedicated autocommit connection"""
+    # A throwaway NullPool engine rather than the shared pooled one: each
+    # task runs in its own asyncio.run() loop, and pooled asyncpg
+    # connections stay bound to the loop that created them, so a connection
+    # returned here would surface in the next task attached to a closed
+    # loop. Closing the connection outright also keeps the session-wide
+    # app.maintenance flag from riding a pooled connection back into
+    # request traffic with RLS effectively disabled.
+    engine = create_async_engine(
+        settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
+        poolclass=NullPool,
+    )
+    try:
+        async with engine.connect() as conn:
+            # REFRESH ... CONCURRENTLY cannot run inside a transaction block
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(_Q_MAINTENANCE_MODE)
+            await conn.execute(statement)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="app.tasks.cleanup_tasks.refresh_dashboard_stats")
+def refresh_dashboard_stats() -> None:
+    """Refresh the per-tenant dashboard rollup view"""
+    asyncio.run(_run_maintenance_statement(_Q_REFRESH_DASHBOARD_STATS))
+    logger.info("Dashboard stats view refreshed")
+
+
+@celery_app.task(name="app.tasks.cleanup_tasks.cleanup_old_data")
+def cleanup_old_data() -> None:
+    """Run the cleanup_old_data() database maintenance function"""
+    asyncio.run(_run_maintenance_statement(_Q_CLEANUP_OLD_DATA))
+    logger.info("Old data cleanup completed")